@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Compare the vectorized TLSH distance with tlsh.diff() called for each candidate.
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import random
+import timeit
+import tlsh
+from fosslight_android._tlsh_distance import TlshDigests, tlsh_diff_many
+
+HEX_CHARS = "0123456789ABCDEF"
+
+
+def random_digest(rand):
+    return "T1" + "".join(rand.choice(HEX_CHARS) for _ in range(70))
+
+
+def scalar_diff(query, candidates):
+    return [tlsh.diff(query, candidate) for candidate in candidates]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TLSH distance microbenchmark")
+    parser.add_argument("-n", "--candidates", type=int, nargs="*", default=[10, 100, 1000, 10000])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    query = random_digest(rand)
+    # decoded: candidates decoded once in advance, as when the same candidates are compared with several binaries.
+    print("candidates\tscalar(ms)\tvectorized(ms)\tdecoded(ms)\tspeedup\tspeedup(decoded)")
+    for count in args.candidates:
+        candidates = [random_digest(rand) for _ in range(count)]
+        digests = TlshDigests(candidates)
+        if list(tlsh_diff_many(query, candidates)) != scalar_diff(query, candidates):
+            raise SystemExit("Distances differ from tlsh.diff()")
+        scalar = min(timeit.repeat(lambda: scalar_diff(query, candidates), number=1, repeat=args.repeat))
+        vectorized = min(timeit.repeat(lambda: tlsh_diff_many(query, candidates), number=1, repeat=args.repeat))
+        decoded = min(timeit.repeat(lambda: digests.diff(query), number=1, repeat=args.repeat))
+        print(f"{count}\t{scalar * 1000:.3f}\t{vectorized * 1000:.3f}\t{decoded * 1000:.3f}\t"
+              f"{scalar / vectorized:.1f}x\t{scalar / decoded:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Binary DB lookup on a few asynchronous connections, with many queries in flight on each of them.
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import logging
+import time
+from ._binary_db_controller import (
+    DB_CONNECT_TIMEOUT,
+    DB_STATEMENT_TIMEOUT,
+    add_connection_failure,
+    add_query_time,
+    get_db_match_changes,
+    get_default_dsn,
+    get_statement,
+    match_binaries,
+    new_statistics
+)
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+ASYNC_BATCH_SIZE = 100  # Binaries looked up with one query
+PIPELINE_DEPTH = 8  # Batches whose queries are sent together on a connection
+DEFAULT_DB_CONNECTIONS = 4
+
+
+def is_async_db_available():
+    # psycopg 3 is an optional dependency: pip install fosslight_android[async]
+    try:
+        import psycopg  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+async def _connect(dsn, statistics):
+    import psycopg
+    try:
+        start_time = time.perf_counter()
+        conn = await psycopg.AsyncConnection.connect(dsn, autocommit=True, connect_timeout=DB_CONNECT_TIMEOUT,
+                                                     options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT}")
+        statistics["wait_time"] += time.perf_counter() - start_time
+        statistics["connections"] += 1
+        return conn
+    except Exception as error:
+        add_connection_failure(statistics, error)
+    return None
+
+
+async def _execute_all(conn, statements, use_pipeline, statistics):
+    # Send the queries of the batches at once and return {position: rows}.
+    rows_list = {}
+    if use_pipeline:
+        async with conn.pipeline():
+            # The results arrive in order, so each query is timed from the result of the previous one.
+            start_time = time.perf_counter()
+            cursors = {position: await conn.execute(get_statement(statement_name)[0], params, prepare=True)
+                       for position, (statement_name, params) in statements.items()}
+            for position, cur in cursors.items():
+                rows_list[position] = await cur.fetchall()
+                end_time = time.perf_counter()
+                add_query_time(statistics, statements[position][0], end_time - start_time)
+                start_time = end_time
+    else:
+        for position, (statement_name, params) in statements.items():
+            start_time = time.perf_counter()
+            cur = await conn.execute(get_statement(statement_name)[0], params, prepare=True)
+            rows_list[position] = await cur.fetchall()
+            add_query_time(statistics, statement_name, time.perf_counter() - start_time)
+    return rows_list
+
+
+def _send_rows(lookup, rows):
+    # Return the next query of match_binaries(), or None and its results when it's done.
+    # StopIteration can't be passed through asyncio.to_thread().
+    try:
+        return lookup.send(rows), None
+    except StopIteration as stop:
+        return None, stop.value
+
+
+async def _look_up_on_connection(conn, queue, platform_version, use_pipeline, changed_list, statistics):
+    decoded_candidates = {}  # file name : (candidate rows, TlshDigests of them), reused by the binaries of the same name
+    while not queue.empty():
+        lookups = {}
+        while len(lookups) < PIPELINE_DEPTH and not queue.empty():
+            lookups[len(lookups)] = match_binaries(queue.get_nowait(), platform_version, decoded_candidates)
+        # The batches go through the 3 steps of match_binaries() together.
+        statements = {position: next(lookup) for position, lookup in lookups.items()}
+        while statements:
+            try:
+                rows_list = await _execute_all(conn, statements, use_pipeline, statistics)
+            except Exception as error:
+                logger.warning(f"READ OSS :{error}")
+                break
+            next_statements = {}
+            for position, rows in rows_list.items():
+                try:
+                    # TLSH of the binaries may be calculated here, so it runs outside the event loop.
+                    statement, results = await asyncio.to_thread(_send_rows, lookups[position], rows)
+                except Exception as error:
+                    logger.warning(f"READ OSS :{error}")
+                    continue
+                if statement is None:
+                    changed_list.extend(get_db_match_changes(results))
+                else:
+                    next_statements[position] = statement
+            statements = next_statements
+
+
+async def _look_up(platform_version, bin_info_list, num_connections, dsn, statistics):
+    import psycopg
+    changed_list = []
+    queue = asyncio.Queue()
+    indexed_list = list(enumerate(bin_info_list))
+    for start in range(0, len(indexed_list), ASYNC_BATCH_SIZE):
+        queue.put_nowait(indexed_list[start:start + ASYNC_BATCH_SIZE])
+    num_connections = max(1, min(num_connections, queue.qsize()))
+
+    connections = [conn for conn in await asyncio.gather(*(_connect(dsn, statistics) for _ in range(num_connections)))
+                   if conn is not None]
+    use_pipeline = psycopg.AsyncPipeline.is_supported()
+    try:
+        await asyncio.gather(*(_look_up_on_connection(conn, queue, platform_version, use_pipeline, changed_list, statistics)
+                               for conn in connections))
+    finally:
+        for conn in connections:
+            await conn.close()
+    return changed_list
+
+
+def get_oss_info_from_db_async(platform_version, bin_info_list, num_connections=DEFAULT_DB_CONNECTIONS, dsn=""):
+    # Same results as get_oss_info_from_db(), looked up in this process.
+    # Return [(index of bin_info_list, {attribute name: value})] and the statistics of the connections.
+    statistics = new_statistics()
+    changed_list = []
+    if bin_info_list:
+        changed_list = asyncio.run(_look_up(platform_version, bin_info_list, num_connections, dsn or get_default_dsn(),
+                                            statistics))
+    return changed_list, statistics
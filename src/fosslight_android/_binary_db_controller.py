@@ -4,141 +4,424 @@
 # SPDX-License-Identifier: Apache-2.0
 import logging
 import os
-import psycopg2
-import pandas as pd
-import tlsh
+import time
 from ._common import CONST_TLSH_NULL
+from ._local_binary_db import LOCAL_STATEMENTS, connect_local_db, export_binary_db, get_local_params
+from ._util import get_file_tlsh
+from ._tlsh_index import TLSH_THRESHOLD
 from fosslight_util.constant import LOGGER_NAME
 
 logger = logging.getLogger(LOGGER_NAME)
 columns = ['filename', 'pathname', 'checksum', 'tlshchecksum', 'ossname', 'ossversion', 'license', 'platformname',
            'platformversion']
+_COLUMN_FILE_NAME = columns.index('filename')
+_COLUMN_CHECKSUM = columns.index('checksum')
+_COLUMN_TLSH = columns.index('tlshchecksum')
+_COLUMN_OSS_NAME = columns.index('ossname')
+_COLUMN_OSS_VERSION = columns.index('ossversion')
+_COLUMN_LICENSE = columns.index('license')
+# Columns of SQL_SELECT_TLSH_CANDIDATES
+_CANDIDATE_FILE_NAME = 0
+_CANDIDATE_TLSH = 1
+_CANDIDATE_UPDATE_DATE = 5
+
+PLATFORM_NAME = "android"
+DB_BATCH_SIZE = 500  # Binaries looked up with one query
+SQL_SELECT_BY_CHECKSUM = f"SELECT {','.join(columns)} FROM lgematching WHERE (filename, checksum) IN " \
+                         "(SELECT * FROM unnest(%(fnames)s::text[], %(values)s::text[]));"
+SQL_SELECT_BY_TLSH = f"SELECT {','.join(columns)} FROM lgematching WHERE (filename, tlshchecksum) IN " \
+                     "(SELECT * FROM unnest(%(fnames)s::text[], %(values)s::text[]));"
+# Ranked by rank_candidates() instead of ORDER BY, as the order differs by the source path of each binary.
+SQL_SELECT_TLSH_CANDIDATES = "SELECT filename, tlshchecksum, sourcepath, lower(platformname), platformversion, updatedate " \
+                             "FROM lgematching WHERE filename = ANY(%(fnames)s::text[]) AND tlshchecksum <> '0';"
+# Prepared once per connection. Parameters are passed in this order.
+_PREPARED_STATEMENTS = {
+    "fl_select_by_checksum": (SQL_SELECT_BY_CHECKSUM, ["fnames", "values"]),
+    "fl_select_tlsh_candidates": (SQL_SELECT_TLSH_CANDIDATES, ["fnames"]),
+    "fl_select_by_tlsh": (SQL_SELECT_BY_TLSH, ["fnames", "values"])
+}
 
 DB_USER = 'bin_analysis_script_user'
 DB_PSWD = 'script_123'
+DB_DSN_ENV = "FOSSLIGHT_ANDROID_DB_DSN"  # Connection string of the binary DB, if -d isn't given
+DB_CONNECT_TIMEOUT = 10  # seconds
+DB_STATEMENT_TIMEOUT = 60000  # milliseconds
+DB_POOL_SIZE = 2  # Connections per process
+
+db_dsn = ""  # Set by main() and shared with the workers. The default binary DB is used if it's empty.
+local_db_file = ""  # SQLite mirror exported by export_to_local_db(). If it's set, the binary DB isn't connected.
+_connection_pool = None  # Connections of this process
+_local_connection = None
+_prepared_connections = {}  # id of connection : True if the statements are prepared, False if PREPARE failed
+_statistics = {"connections": 0, "connection_failures": 0, "last_error": "", "wait_time": 0.0, "queries": {}}
+
+
+def get_default_dsn():
+    import psycopg2.extensions
+    return psycopg2.extensions.make_dsn(dbname='bat', user=DB_USER, host='bat.lge.com', password=DB_PSWD, port='5432')
+
+
+def get_db_dsn(dsn=""):
+    return dsn or os.environ.get(DB_DSN_ENV, "")
+
+
+def get_connection_pool():
+    global _connection_pool
+    if _connection_pool is None:
+        import psycopg2.pool
+        _connection_pool = psycopg2.pool.SimpleConnectionPool(0, DB_POOL_SIZE, dsn=db_dsn or get_default_dsn(),
+                                                              connect_timeout=DB_CONNECT_TIMEOUT,
+                                                              options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT}")
+    return _connection_pool
+
+
+def close_connection_pool():
+    # Close the connections of this process and return its statistics.
+    global _connection_pool, _local_connection
+    if _connection_pool is not None:
+        _connection_pool.closeall()
+        _connection_pool = None
+        _prepared_connections.clear()
+    if _local_connection is not None:
+        _local_connection.close()
+        _local_connection = None
+    return _statistics
+
+
+def export_to_local_db(local_db_file, full_export=False):
+    # Copy the rows of the android platform from the binary DB to a local SQLite file, which is used by -b.
+    import psycopg2
+    success = False
+    conn = ""
+    try:
+        conn = psycopg2.connect(db_dsn or get_default_dsn(), connect_timeout=DB_CONNECT_TIMEOUT)
+        export_binary_db(local_db_file, conn, PLATFORM_NAME, full_export)
+        success = True
+    except Exception as error:
+        logger.error(f"Failed to export the binary DB to {local_db_file}:{error}")
+    finally:
+        if conn != "":
+            conn.close()
+    return success
+
+
+def connect_to_local_db():
+    global _local_connection
+    if _local_connection is None:
+        _local_connection = connect_local_db(local_db_file)
+        _statistics["connections"] += 1
+    return _local_connection
 
 
 def connect_to_lge_bin_db():
+    # Take a connection from the pool of this process. Give it back by disconnect_lge_bin_db().
     conn = ""
     cur = ""
-    user = DB_USER
-    password = DB_PSWD
-    host_product = 'bat.lge.com'
-    dbname = 'bat'
-    port = '5432'
-
-    connection_string = "dbname={dbname} user={user} host={host} password={password} port={port}" \
-        .format(dbname=dbname,
-                user=user,
-                host=host_product,
-                password=password,
-                port=port)
     try:
-        conn = psycopg2.connect(connection_string)
+        if local_db_file:
+            conn = connect_to_local_db()
+            return conn, conn.cursor()
+        start_time = time.perf_counter()
+        pool = get_connection_pool()
+        conn = pool.getconn()
+        if conn.closed:  # e.g. dropped by the server while it was idle
+            _prepared_connections.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        _statistics["wait_time"] += time.perf_counter() - start_time
+        if id(conn) not in _prepared_connections:
+            conn.autocommit = True  # Lookups only, and a failed query doesn't abort the following ones.
+            _statistics["connections"] += 1
+            _prepared_connections[id(conn)] = prepare_statements(conn)
         cur = conn.cursor()
-    except Exception:
+    except Exception as error:
+        add_connection_failure(_statistics, error)
+        if conn != "":
+            disconnect_lge_bin_db(conn, cur)
         conn = ""
         cur = ""
     return conn, cur
 
 
-def get_oss_info_from_db(platform_version, bin_info_list, return_list):
+def prepare_statements(conn):
+    try:
+        with conn.cursor() as cur:
+            for name, (sql_query, param_names) in _PREPARED_STATEMENTS.items():
+                for idx, param_name in enumerate(param_names):
+                    sql_query = sql_query.replace(f"%({param_name})s", f"${idx + 1}")
+                cur.execute(f"PREPARE {name} AS {sql_query}")
+        return True
+    except Exception as error:  # e.g. behind a pooler that doesn't keep prepared statements
+        logger.debug(f"Failed to prepare statements:{error}")
+    return False
+
+
+def format_db_statistics(statistics_list):
+    # Merge the statistics of the workers.
+    connections = sum(statistics["connections"] for statistics in statistics_list)
+    failures = sum(statistics["connection_failures"] for statistics in statistics_list)
+    wait_time = sum(statistics["wait_time"] for statistics in statistics_list)
+    queries = {}
+    for statistics in statistics_list:
+        for name, (count, total, maximum) in statistics["queries"].items():
+            merged = queries.setdefault(name, [0, 0.0, 0.0])
+            merged[0] += count
+            merged[1] += total
+            merged[2] = max(merged[2], maximum)
+    str_queries = ", ".join(f"{name.replace('fl_select_', '')} {count} queries "
+                            f"(avg {total / count * 1000:.1f}ms, max {maximum * 1000:.1f}ms)"
+                            for name, (count, total, maximum) in queries.items() if count)
+    result = f"connections: {connections}, failed: {failures}, waiting for connections: {wait_time:.2f}s"
+    if str_queries:
+        result += f", {str_queries}"
+    last_errors = [statistics["last_error"] for statistics in statistics_list if statistics["last_error"]]
+    if last_errors:
+        result += f", last error: {last_errors[-1]}"
+    return result
+
 
+def get_db_source(dsn="", local_db=""):
+    # Binary DB that results are looked up from, without the password
+    if local_db:
+        return local_db
+    import psycopg2.extensions
+    dsn = psycopg2.extensions.parse_dsn(dsn or get_default_dsn())
+    return " ".join(f"{key}={value}" for key, value in sorted(dsn.items()) if key != "password")
+
+
+def set_db_match(item, db_match):
+    # Set a result of the binary DB, ([(OSS name, OSS version, license)], Auto ID comment, is_new_bin), to the item
+    # and return the changed fields.
+    oss_rows, item_comment, is_new = db_match
+    item.set_comment(item_comment)
+    item.is_new_bin = is_new
+    changes = {"comment": item.comment, "is_new_bin": item.is_new_bin}
+    for row_idx, (oss_name, oss_version, license_name) in enumerate(oss_rows):
+        if row_idx == 0:
+            item.set_oss_name(oss_name)
+            item.set_oss_version(oss_version)
+            item.set_license(license_name)
+            changes.update({"oss_name": item.oss_name, "oss_version": item.oss_version, "license": item.license})
+        else:  # In case more than 2 OSS is used for this bin.
+            item.set_additional_oss_items(oss_name + '\t' + oss_version + '\t' + license_name)
+            changes["additional_oss_items"] = item.additional_oss_items
+    return changes
+
+
+def get_oss_info_from_db(platform_version, bin_info_list):
+    # Return [(index, {attribute name: value})] of the binaries found in the binary DB.
+    changed_list = []
     conn, cur = connect_to_lge_bin_db()
     if conn != "" and cur != "":
-        for item in bin_info_list:
+        decoded_candidates = {}  # file name : (candidate rows, TlshDigests of them), reused by the binaries of the same name
+        for start in range(0, len(bin_info_list), DB_BATCH_SIZE):
             try:
-                checksum_value = item.checksum
-                tlsh_value = item.tlsh
-                bin_file = item.bin_name
-                bin_file_name = os.path.basename(bin_file)
-                # Get OSS Information From Binary DB by matching checksum , filename, tlsh
-                df_result, item_comment, is_new = get_oss_info_by_tlsh_and_filename(bin_file_name,
-                                                                                    checksum_value, tlsh_value,
-                                                                                    item.source_code_path,
-                                                                                    platform_version, conn, cur)
-                item.set_comment(item_comment)
-                item.is_new_bin = is_new
-                if df_result is not None and len(df_result) > 0:
-                    for idx, row in df_result.iterrows():
-                        if idx == 0:
-                            item.set_oss_name(row['ossname'])
-                            item.set_oss_version(row['ossversion'])
-                            item.set_license(row['license'])
-                        else:  # In case more than 2 OSS is used for this bin.
-                            item.set_additional_oss_items(row['ossname'] + '\t' + row['ossversion'] + '\t' + row['license'])
+                results = get_oss_info_by_tlsh_and_filename(bin_info_list[start:start + DB_BATCH_SIZE],
+                                                            platform_version, conn, cur, decoded_candidates)
             except Exception as error:
-                logger.warn(f"READ OSS :{error}")
+                logger.warning(f"READ OSS :{error}")
+                continue
+            changed_list.extend(get_db_match_changes(results))
 
         disconnect_lge_bin_db(conn, cur)
-    return_list.extend(bin_info_list)
-
-
-def get_oss_info_by_tlsh_and_filename(file_name, checksum_value, tlsh_value, source_path, platform_version, conn, cur):
-    sql_statement = "SELECT filename,pathname,checksum,tlshchecksum,ossname,ossversion,license,platformname,platformversion FROM lgematching "
-    sql_statement_checksum = " WHERE filename=%(fname)s AND checksum=%(checksum)s;"
-    sql_checksum_params = {'fname': file_name, 'checksum': checksum_value}
-    sql_statement_filename = "SELECT tlshchecksum FROM lgematching WHERE filename=%(fname)s AND tlshchecksum <> '0' ORDER BY ( " \
-                             "CASE " \
-                             "WHEN sourcepath = %(src_path)s AND lower(platformname)=%(plat_name)s " \
-                             "AND platformversion=%(plat_version)s THEN 1 " \
-                             "WHEN sourcepath = %(src_path)s AND lower(platformname)=%(plat_name)s THEN 2 " \
-                             "WHEN lower(platformname)=%(plat_name)s AND platformversion=%(plat_version)s THEN 3 " \
-                             "WHEN lower(platformname)=%(plat_name)s THEN 4 " \
-                             "ELSE 5 " \
-                             "END), updatedate DESC;"
-    sql_filename_params = {'fname': file_name, 'src_path': source_path, 'plat_version': platform_version, 'plat_name': "android"}
-    auto_id_comment = ""
-    final_result_item = ""
-    is_new = False
+    return changed_list
+
+
+def get_db_match_changes(results):
+    # Return [(index, {attribute name: value})] of the results of match_binaries().
+    changed_list = []
+    for idx, item, result_rows, item_comment, is_new, tlsh_value in results:
+        try:
+            db_match = ([(row[_COLUMN_OSS_NAME], row[_COLUMN_OSS_VERSION], row[_COLUMN_LICENSE]) for row in result_rows],
+                        item_comment, is_new)
+            changes = set_db_match(item, db_match)
+            if tlsh_value is not None and not item.tlsh_calculated:
+                changes.update({"tlsh": tlsh_value, "tlsh_calculated": True})
+            changes["db_match"] = db_match
+            changed_list.append((idx, changes))
+        except Exception as error:
+            logger.warning(f"READ OSS :{error}")
+    return changed_list
+
+
+def get_oss_info_by_tlsh_and_filename(bin_info_list, platform_version, conn, cur, decoded_candidates=None):
+    # Run the queries of match_binaries() on the connection one by one.
+    lookup = match_binaries(bin_info_list, platform_version, decoded_candidates)
+    try:
+        statement_name, params = next(lookup)
+        while True:
+            statement_name, params = lookup.send(get_list_by_using_query(statement_name, params, conn, cur))
+    except StopIteration as stop:
+        return stop.value
+
+
+def match_binaries(bin_info_list, platform_version, decoded_candidates=None):
+    # Match a batch of binaries with 3 queries in total instead of up to 3 queries per binary.
+    # 1. filename and checksum, 2. files of the same name for the binaries not found by 1, 3. filename and matched TLSH.
+    # Each query is yielded as (statement name, params) and its rows are sent back, so that the same matching runs
+    # on a blocking or an asynchronous connection.
+    # Return [(index, item, result rows, Auto ID comment, is_new, tlsh)]. If TLSH of a binary isn't calculated yet,
+    # it is calculated only when there are files of the same name to compare with.
+    if decoded_candidates is None:
+        decoded_candidates = {}
+    bin_list = [(idx, item, os.path.basename(item.bin_name)) for idx, item in bin_info_list]
 
     # Match checksum and fileName
-    df_result = get_list_by_using_query(sql_statement + sql_statement_checksum, sql_checksum_params, columns, conn, cur)
-    if df_result is not None and len(df_result) > 0:  # Found a file with the same checksum.
-        final_result_item = df_result
-    else:  # Can't find files that have same name and checksum
-        # Match tlsh and fileName
-        df_result = get_list_by_using_query(sql_statement_filename, sql_filename_params, ['tlshchecksum'], conn, cur)
-        if df_result is None or len(df_result) <= 0:
-            final_result_item = ""
-            auto_id_comment = "New Binary/"
-            is_new = True
-        elif tlsh_value == CONST_TLSH_NULL:  # Couldn't get the tlsh of a file.
-            final_result_item = ""
+    checksum_keys = list(dict.fromkeys((file_name, item.checksum) for _, item, file_name in bin_list))
+    rows = yield "fl_select_by_checksum", get_unnest_params(checksum_keys)
+    rows_by_checksum = group_rows(rows, _COLUMN_FILE_NAME, _COLUMN_CHECKSUM)
+
+    # Match tlsh and fileName of the binaries that have no file with the same checksum
+    missed_names = list(dict.fromkeys(file_name for _, item, file_name in bin_list
+                                      if (file_name, item.checksum) not in rows_by_checksum))
+    candidates_by_name = {}
+    if missed_names:
+        rows = yield "fl_select_tlsh_candidates", {'fnames': missed_names}
+        candidates_by_name = group_rows(rows, _CANDIDATE_FILE_NAME)
+
+    results = []
+    matched_tlsh_list = {}  # position in results : matched tlsh
+    for idx, item, file_name in bin_list:
+        tlsh_value = item.tlsh if item.tlsh_calculated else None
+        result_rows = rows_by_checksum.get((file_name, item.checksum), [])
+        auto_id_comment = ""
+        is_new = False
+        if not result_rows:  # Can't find files that have same name and checksum
+            candidates = candidates_by_name.get((file_name,), [])
+            if not candidates:
+                auto_id_comment = "New Binary/"
+                is_new = True
+            else:
+                if tlsh_value is None:
+                    tlsh_value = get_file_tlsh(item.bin_name_with_installed_path)
+                if tlsh_value != CONST_TLSH_NULL:  # Couldn't get the tlsh of a file.
+                    matched_tlsh = find_matched_tlsh(tlsh_value, candidates, item.source_code_path, platform_version,
+                                                     decoded_candidates, file_name)
+                    if matched_tlsh != "":
+                        matched_tlsh_list[len(results)] = (file_name, matched_tlsh)
+        results.append([idx, item, result_rows, auto_id_comment, is_new, tlsh_value])
+
+    if matched_tlsh_list:
+        tlsh_keys = list(dict.fromkeys(matched_tlsh_list.values()))
+        rows = yield "fl_select_by_tlsh", get_unnest_params(tlsh_keys)
+        rows_by_tlsh = group_rows(rows, _COLUMN_FILE_NAME, _COLUMN_TLSH)
+        for position, key in matched_tlsh_list.items():
+            results[position][2] = rows_by_tlsh.get(key, [])
+    return results
+
+
+def get_unnest_params(keys):
+    return {'fnames': [key[0] for key in keys], 'values': [key[1] for key in keys]}
+
+
+def group_rows(rows, *key_columns):
+    # Rows by the values of the key columns, in the order of the query result
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(tuple(row[column] for column in key_columns), []).append(row)
+    return grouped
+
+
+def rank_candidates(candidates, source_path, platform_version):
+    # Return the positions of the candidates in the same order as
+    # ORDER BY (CASE ... END), updatedate DESC of PostgreSQL, where NULL comes first in descending order.
+    def get_rank(position):
+        _, _, candidate_source_path, candidate_platform_name, candidate_platform_version, _ = candidates[position]
+        is_platform = candidate_platform_name == PLATFORM_NAME
+        is_source_path = candidate_source_path == source_path
+        is_version = candidate_platform_version == platform_version
+        if is_source_path and is_platform and is_version:
+            return 1
+        elif is_source_path and is_platform:
+            return 2
+        elif is_platform and is_version:
+            return 3
+        elif is_platform:
+            return 4
+        return 5
+
+    positions = range(len(candidates))
+    no_date = [position for position in positions if candidates[position][_CANDIDATE_UPDATE_DATE] is None]
+    dated = sorted((position for position in positions if candidates[position][_CANDIDATE_UPDATE_DATE] is not None),
+                   key=lambda position: candidates[position][_CANDIDATE_UPDATE_DATE], reverse=True)
+    return sorted(no_date + dated, key=get_rank)
+
+
+def find_matched_tlsh(tlsh_value, candidates, source_path, platform_version, decoded_candidates, file_name):
+    # Return the TLSH of the highest ranked candidate within the threshold, or "".
+    from ._tlsh_distance import INVALID_DISTANCE, VECTORIZE_MIN_CANDIDATES, TlshDigests, find_first_within
+    matched_tlsh = ""
+    try:
+        digests = None
+        if len(candidates) >= VECTORIZE_MIN_CANDIDATES:
+            cached = decoded_candidates.get(file_name)
+            if cached is None:
+                cached = (candidates, TlshDigests([candidate[_CANDIDATE_TLSH] for candidate in candidates]))
+                decoded_candidates[file_name] = cached
+            # The rows of another batch may come in a different order, so the rows the digests were decoded from are used.
+            candidates, digests = cached
+        ranked = rank_candidates(candidates, source_path, platform_version)
+        if digests is None:
+            ranked_tlsh = [candidates[position][_CANDIDATE_TLSH] for position in ranked]
+            matched_idx = find_first_within(tlsh_value, ranked_tlsh, TLSH_THRESHOLD)
+            if matched_idx >= 0:  # MATCHED
+                matched_tlsh = ranked_tlsh[matched_idx]
         else:
-            matched_tlsh = ""
-            for row in df_result.tlshchecksum:
-                try:
-                    if row != CONST_TLSH_NULL:
-                        tlsh_diff = tlsh.diff(row, tlsh_value)
-                        if tlsh_diff <= 120:  # MATCHED
-                            matched_tlsh = row
-                            break
-                except Exception as error:  # TLSH COMPARISON FAILED
-                    logger.debug(f"Comparing TLSH:{error}")
-
-            if matched_tlsh != "":
-                final_result_item = get_list_by_using_query(
-                    sql_statement + " WHERE filename=%(fname)s AND tlshchecksum=%(tlsh)s;", {'fname': file_name, 'tlsh': matched_tlsh},
-                    columns, conn, cur)
-
-    return final_result_item, auto_id_comment, is_new
-
-
-def get_list_by_using_query(sql_query, params, columns, conn, cur):
-    result_rows = ""  # DataFrame
+            distance = digests.diff(tlsh_value)
+            for position in ranked:
+                if distance[position] != INVALID_DISTANCE and distance[position] <= TLSH_THRESHOLD:  # MATCHED
+                    matched_tlsh = candidates[position][_CANDIDATE_TLSH]
+                    break
+    except Exception as error:  # TLSH COMPARISON FAILED
+        logger.debug(f"Comparing TLSH:{error}")
+    return matched_tlsh
+
+
+def get_list_by_using_query(statement_name, params, conn, cur):
+    sql_query, param_names = get_statement(statement_name)
+    if conn is _local_connection:
+        sql_query = LOCAL_STATEMENTS[statement_name]
+        params = get_local_params(params)
+    elif _prepared_connections.get(id(conn)):
+        sql_query = f"EXECUTE {statement_name} ({', '.join(f'%({param_name})s' for param_name in param_names)})"
+    start_time = time.perf_counter()
     cur.execute(sql_query, params)
     rows = cur.fetchall()
+    add_query_time(_statistics, statement_name, time.perf_counter() - start_time)
+    return rows if rows is not None else []
+
+
+def get_statement(statement_name):
+    # SQL of the lookup query and the names of its parameters in order
+    return _PREPARED_STATEMENTS[statement_name]
+
+
+def new_statistics():
+    return {"connections": 0, "connection_failures": 0, "last_error": "", "wait_time": 0.0, "queries": {}}
+
+
+def add_query_time(statistics, statement_name, elapsed):
+    query_statistics = statistics["queries"].setdefault(statement_name, [0, 0.0, 0.0])  # count, total, max
+    query_statistics[0] += 1
+    query_statistics[1] += elapsed
+    query_statistics[2] = max(query_statistics[2], elapsed)
+
 
-    if rows is not None and len(rows) > 0:
-        result_rows = pd.DataFrame(data=rows, columns=columns)
-    return result_rows
+def add_connection_failure(statistics, error):
+    statistics["connection_failures"] += 1
+    statistics["last_error"] = " ".join(str(error).split())
+    logger.warning(f"Failed to connect to the binary DB:{error}")
 
 
 def disconnect_lge_bin_db(conn, cur):
-    # Close connection
+    # Give the connection back to the pool, so that the next chunk of this process reuses it.
     try:
-        cur.close()
-        conn.close()
+        if cur != "":
+            cur.close()
+        if conn is _local_connection:  # Kept open until close_connection_pool()
+            return
+        if conn.closed:
+            _prepared_connections.pop(id(conn), None)
+        get_connection_pool().putconn(conn, close=bool(conn.closed))
     except Exception:
         pass
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import os
+import glob
+import json
+import stat
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+MAGIC_READ_SIZE = 4096
+TYPE_ELF = "elf"
+TYPE_ZIP = "zip"
+TYPE_AR = "ar"
+TYPE_FONT = "font"
+TYPE_ARCHIVE = "archive"
+TYPE_TEXT = "text"
+TYPE_EMPTY = "empty"
+TYPE_DATA = "data"
+
+# Leading bytes of the file types the scanner is interested in.
+_MAGIC_TABLE = [
+    (b"\x7fELF", TYPE_ELF),
+    (b"PK\x03\x04", TYPE_ZIP),  # apk, jar, apex
+    (b"PK\x05\x06", TYPE_ZIP),  # empty zip archive
+    (b"!<arch>\n", TYPE_AR),  # static library
+    (b"\x00\x01\x00\x00", TYPE_FONT),  # TrueType (sfnt)
+    (b"OTTO", TYPE_FONT),  # OpenType with CFF outlines
+    (b"true", TYPE_FONT),
+    (b"ttcf", TYPE_FONT),  # TrueType collection
+    (b"wOFF", TYPE_FONT),
+    (b"wOF2", TYPE_FONT),
+    # Compressed files and archives, which file reports by their format instead of "data".
+    (b"\x1f\x8b", TYPE_ARCHIVE),  # gzip
+    (b"\xfd7zXZ\x00", TYPE_ARCHIVE),  # xz
+    (b"BZh", TYPE_ARCHIVE),  # bzip2
+    (b"\x28\xb5\x2f\xfd", TYPE_ARCHIVE),  # zstd
+    (b"\x04\x22\x4d\x18", TYPE_ARCHIVE),  # lz4
+    (b"\x02\x21\x4c\x18", TYPE_ARCHIVE),  # lz4 legacy, e.g. kernel and ramdisk
+    (b"7z\xbc\xaf\x27\x1c", TYPE_ARCHIVE),  # 7-zip
+    (b"\x3a\xff\x26\xed", TYPE_ARCHIVE),  # Android sparse image
+    (b"ANDROID!", TYPE_ARCHIVE),  # Android boot image
+    (b"070701", TYPE_ARCHIVE),  # cpio
+    (b"070702", TYPE_ARCHIVE),  # cpio with CRC
+]
+_TAR_MAGIC_OFFSET = 257
+_TAR_MAGIC = b"ustar"
+# Bytes that never appear in text files (same table as libmagic uses to report "data").
+_NON_TEXT_BYTES = bytes(list(range(0x00, 0x07)) + list(range(0x0e, 0x1b)) + list(range(0x1c, 0x20)) + [0x7f])
+
+# Top-level entries of the build output path that are not scanned as installed outputs.
+_PRUNE_NAMES = ["root", "symbols", "dex_bootjars"]
+_PRUNE_PREFIXES = ("obj", "factory_")
+INSTALLED_FILES_PREFIX = "installed-files"
+
+
+def classify_file(file_path):
+    # Return None if the file can't be read.
+    try:
+        with open(file_path, "rb") as f:
+            header = f.read(MAGIC_READ_SIZE)
+    except OSError as error:
+        logger.debug(f"classify_file:{error}")
+        return None
+    return classify_bytes(header)
+
+
+def classify_bytes(header):
+    if not header:
+        return TYPE_EMPTY
+    for magic, file_type in _MAGIC_TABLE:
+        if header.startswith(magic):
+            return file_type
+    if header.startswith(_TAR_MAGIC, _TAR_MAGIC_OFFSET):
+        return TYPE_ARCHIVE
+    if header.translate(None, _NON_TEXT_BYTES) != header:
+        return TYPE_DATA
+    return TYPE_TEXT
+
+
+def is_executable_candidate(file_path, file_type, skip_odex=True):
+    # Same as: file | egrep "ELF\ |ARM,|\.jar|\.apk" | grep -v "\.o:" | grep -v "\.odex:"
+    line = f"{file_path}:"
+    if file_type != TYPE_ELF and ".jar" not in file_path and ".apk" not in file_path:
+        return False
+    if ".o:" in line:
+        return False
+    if skip_odex and ".odex:" in line:
+        return False
+    return True
+
+
+def is_root_executable_candidate(file_path, file_type):
+    return is_executable_candidate(file_path, file_type, False)
+
+
+def is_static_library_candidate(file_path, file_type):
+    return file_type == TYPE_AR
+
+
+def is_font_candidate(file_path, file_type):
+    # The former 'egrep "font"' was applied to the whole line, so the path under fonts/ matched as well.
+    return file_type == TYPE_FONT or "font" in file_path
+
+
+def is_out_dir_data_candidate(file_path, file_type):
+    return file_type == TYPE_DATA and ".img" not in os.path.basename(file_path)
+
+
+def is_pruned_top_level_entry(entry):
+    name = entry.name
+    if name == "system":
+        return entry.is_dir(follow_symlinks=False)
+    return is_pruned_top_level_name(name)
+
+
+def is_pruned_top_level_name(name):
+    return name in _PRUNE_NAMES or name.startswith(_PRUNE_PREFIXES)
+
+
+def is_installed_file_candidate(file_path, file_type, rel_path):
+    # Apply the rule of the search that would have found the file while walking the build output path.
+    top_dir = rel_path.split("/", 1)[0]
+    if top_dir == "system":
+        if rel_path.startswith("system/fonts/") and is_font_candidate(file_path, file_type):
+            return True
+        return is_executable_candidate(file_path, file_type)
+    elif top_dir == "root":
+        return is_root_executable_candidate(file_path, file_type)
+    elif is_pruned_top_level_name(top_dir):
+        return False
+    return is_executable_candidate(file_path, file_type)
+
+
+def walk_files(top, prune=None, max_depth=-1):
+    # Yield os.DirEntry of regular files under top, without following symbolic links.
+    stack = [(top, 0)]
+    while stack:
+        current_dir, depth = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if prune is not None and depth == 0 and prune(entry):
+                                continue
+                            if max_depth < 0 or depth + 1 < max_depth:
+                                stack.append((entry.path, depth + 1))
+                        elif entry.is_file(follow_symlinks=False):
+                            if prune is not None and depth == 0 and prune(entry):
+                                continue
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError as error:
+            logger.debug(f"walk_files:{error}")
+
+
+def get_file_type(file_path, stat_result, inventory=None, file_types=None):
+    file_type = file_types.get(file_path) if file_types is not None else None
+    if file_type is None:
+        if inventory:
+            file_type = inventory.get(file_path, stat_result, "file_type")
+        if file_type is None:
+            file_type = classify_file(file_path) if stat_result.st_size > 0 else TYPE_EMPTY
+            if inventory and file_type is not None:
+                inventory.set(file_path, stat_result, "file_type", file_type)
+        if file_types is not None:
+            file_types[file_path] = file_type
+    return file_type
+
+
+def find_files_by_type(top, is_candidate, prune=None, max_depth=-1, inventory=None, file_types=None):
+    found_files = []
+    for entry in walk_files(top, prune, max_depth):
+        file_path = entry.path
+        file_type = get_file_type(file_path, entry.stat(follow_symlinks=False), inventory, file_types)
+        if is_candidate(file_path, file_type):
+            found_files.append(file_path)
+    return found_files
+
+
+def find_binary_candidates(build_out_path, inventory=None):
+    system_path = os.path.join(build_out_path, "system")
+    root_path = os.path.join(build_out_path, "root")
+    obj_static_lib = os.path.join(build_out_path, "obj/STATIC_LIBRARIES")
+    font_path = os.path.join(build_out_path, "system/fonts")
+
+    search_list = [
+        (system_path, is_executable_candidate, None, -1),
+        (root_path, is_root_executable_candidate, None, -1),
+        (build_out_path, is_out_dir_data_candidate, None, 1),
+        (obj_static_lib, is_static_library_candidate, None, -1),
+        (build_out_path, is_executable_candidate, is_pruned_top_level_entry, -1),
+        (font_path, is_font_candidate, None, -1)
+    ]
+
+    file_types = {}  # Some files are visited by more than one search.
+    candidates = {}
+    for top, is_candidate, prune, max_depth in search_list:
+        for file_path in find_files_by_type(top, is_candidate, prune, max_depth, inventory, file_types):
+            candidates[file_path] = ""
+    return list(candidates.keys())
+
+
+def read_installed_files_manifests(build_out_path):
+    # installed-files*.json (or .txt) per partition, written by the build. Name is relative to the build output path.
+    installed_files = {}
+    manifest_files = {}
+    for manifest_file in sorted(glob.glob(os.path.join(build_out_path, f"{INSTALLED_FILES_PREFIX}*"))):
+        partition, extension = os.path.splitext(os.path.basename(manifest_file))
+        if extension == ".json" or (extension == ".txt" and partition not in manifest_files):
+            manifest_files[partition] = manifest_file
+
+    for manifest_file in manifest_files.values():
+        try:
+            if manifest_file.endswith(".json"):
+                with open(manifest_file, "r") as f:
+                    for row in json.load(f):
+                        installed_files[row["Name"].lstrip("/")] = int(row.get("Size", -1))
+            else:
+                with open(manifest_file, "r") as f:
+                    for line in f:
+                        size_and_name = line.split(None, 1)
+                        if len(size_and_name) == 2:
+                            installed_files[size_and_name[1].strip().lstrip("/")] = int(size_and_name[0])
+            logger.debug(f"Installed file list: {manifest_file}")
+        except Exception as error:
+            logger.warning(f"Failed to read {manifest_file}:{error}")
+    return installed_files
+
+
+def is_in_symlinked_dir(build_out_path, rel_dir, checked_dirs):
+    # Walking the build output path doesn't follow symbolic links, but the installed-files lists do.
+    if not rel_dir:
+        return False
+    if rel_dir not in checked_dirs:
+        checked_dirs[rel_dir] = os.path.islink(os.path.join(build_out_path, rel_dir)) or \
+            is_in_symlinked_dir(build_out_path, os.path.dirname(rel_dir), checked_dirs)
+    return checked_dirs[rel_dir]
+
+
+def find_binary_candidates_from_installed_files(build_out_path, inventory=None):
+    # Return None if the build output path has no installed-files list.
+    installed_files = read_installed_files_manifests(build_out_path)
+    if not installed_files:
+        return None
+
+    candidates = {}
+    checked_dirs = {}
+    covered_dirs = set()
+    size_changed = 0
+    for rel_path, size in installed_files.items():
+        covered_dirs.add(rel_path.split("/", 1)[0])
+        file_path = os.path.join(build_out_path, rel_path)
+        try:
+            stat_result = os.lstat(file_path)
+        except OSError:
+            continue
+        if not stat.S_ISREG(stat_result.st_mode) or \
+                is_in_symlinked_dir(build_out_path, os.path.dirname(rel_path), checked_dirs):
+            continue
+        if size != stat_result.st_size:
+            size_changed += 1
+        if is_installed_file_candidate(file_path, get_file_type(file_path, stat_result, inventory), rel_path):
+            candidates[file_path] = ""
+    if size_changed:
+        logger.info(f"{size_changed} files differ in size from the installed-files list.")
+
+    # Outputs that are not installed to a partition still need to be searched.
+    def is_pruned(entry):
+        return is_pruned_top_level_entry(entry) or entry.name in covered_dirs
+
+    search_list = [
+        (build_out_path, is_out_dir_data_candidate, None, 1),
+        (os.path.join(build_out_path, "obj/STATIC_LIBRARIES"), is_static_library_candidate, None, -1),
+        (build_out_path, is_executable_candidate, is_pruned, -1)
+    ]
+    if "system" not in covered_dirs:
+        search_list.append((os.path.join(build_out_path, "system"), is_executable_candidate, None, -1))
+        search_list.append((os.path.join(build_out_path, "system/fonts"), is_font_candidate, None, -1))
+    if "root" not in covered_dirs:
+        search_list.append((os.path.join(build_out_path, "root"), is_root_executable_candidate, None, -1))
+    for top, is_candidate, prune, max_depth in search_list:
+        for file_path in find_files_by_type(top, is_candidate, prune, max_depth, inventory):
+            candidates[file_path] = ""
+    return list(candidates.keys())
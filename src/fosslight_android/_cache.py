@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import os
+import hashlib
+import pickle
+import sqlite3
+import time
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+CACHE_DIR_NAME = "fosslight_android_cache"
+INVENTORY_VERSION = 2  # Increased when a field is calculated differently, e.g. file_type
+INVENTORY_FILE_NAME = f"file_inventory_{INVENTORY_VERSION}.db"
+MATCH_RESULT_FILE_NAME = "binary_db_result.db"
+MATCH_RESULT_TTL = 7 * 24 * 60 * 60  # seconds. Results of the binary DB are looked up again after a week.
+MATCH_RESULT_MAX_ENTRIES = 500000
+SQLITE_MAX_PARAMS = 500
+
+cache_dir = ""  # Empty if the cache can't be used.
+cold_run = False  # Ignore cached values, but store the newly calculated ones.
+
+
+def init_cache(output_dir, cold=False):
+    global cache_dir, cold_run
+    cold_run = cold
+    try:
+        cache_dir = os.path.join(output_dir, CACHE_DIR_NAME)
+        os.makedirs(cache_dir, exist_ok=True)
+    except Exception as error:
+        logger.warning(f"Can't create a cache directory:{error}")
+        cache_dir = ""
+    return cache_dir
+
+
+def get_cache_file(file_name):
+    if not cache_dir:
+        return ""
+    return os.path.join(cache_dir, file_name)
+
+
+def load_cache_object(file_name):
+    # Return None if there is no cache or a cold run is requested.
+    cache_file = get_cache_file(file_name)
+    if not cache_file or cold_run or not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except Exception as error:
+        logger.debug(f"Failed to read cache {cache_file}:{error}")
+    return None
+
+
+def save_cache_object(file_name, obj):
+    cache_file = get_cache_file(file_name)
+    if not cache_file:
+        return
+    try:
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except Exception as error:
+        logger.debug(f"Failed to write cache {cache_file}:{error}")
+
+
+def get_file_sha1(file_path, chunk_size=1 << 20):
+    sha1_hash = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha1_hash.update(chunk)
+    return sha1_hash.hexdigest()
+
+
+def get_cache_key(*values):
+    # Short and file-name safe key, e.g. of an absolute path.
+    return hashlib.sha1("\0".join(str(value) for value in values).encode("utf-8")).hexdigest()[:16]
+
+
+class FileInventory:
+    # Per-file results kept across runs. A row is only reused while (inode, size, mtime_ns) of the path are unchanged.
+    _FIELDS = ["file_type", "sha1", "tlsh"]
+
+    def __init__(self, db_file, cold=False):
+        self.db_file = db_file
+        self.cold = cold
+        self._entries = {}  # path : [inode, size, mtime_ns, file_type, sha1, tlsh]
+        self._updated = {}
+        self._counter = {field: [0, 0] for field in self._FIELDS}  # field : [hit, miss]
+        if not cold:
+            self.load()
+
+    def load(self):
+        if not self.db_file or not os.path.isfile(self.db_file):
+            return
+        try:
+            conn = sqlite3.connect(self.db_file)
+            try:
+                for row in conn.execute("SELECT path, inode, size, mtime_ns, file_type, sha1, tlsh FROM inventory"):
+                    self._entries[row[0]] = list(row[1:])
+            finally:
+                conn.close()
+        except Exception as error:
+            logger.debug(f"Failed to read the file inventory:{error}")
+            self._entries = {}
+
+    def save(self):
+        if not self.db_file or not self._updated:
+            return
+        try:
+            conn = sqlite3.connect(self.db_file)
+            try:
+                with conn:
+                    conn.execute("CREATE TABLE IF NOT EXISTS inventory (path TEXT PRIMARY KEY, inode INTEGER, "
+                                 "size INTEGER, mtime_ns INTEGER, file_type TEXT, sha1 TEXT, tlsh TEXT)")
+                    conn.executemany("INSERT OR REPLACE INTO inventory VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     [[path] + values for path, values in self._updated.items()])
+            finally:
+                conn.close()
+            self._updated = {}
+        except Exception as error:
+            logger.warning(f"Failed to write the file inventory:{error}")
+
+    def get(self, path, stat_result, field):
+        # Return the cached value of the field, or None if the file changed or it was never calculated.
+        value = None
+        entry = self._entries.get(os.path.abspath(path))
+        if entry and entry[:3] == [stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns]:
+            value = entry[3 + self._FIELDS.index(field)]
+        self._counter[field][0 if value is not None else 1] += 1
+        return value
+
+    def set(self, path, stat_result, field, value):
+        path = os.path.abspath(path)
+        signature = [stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns]
+        entry = self._entries.get(path)
+        if not entry or entry[:3] != signature:
+            entry = signature + [None] * len(self._FIELDS)
+            self._entries[path] = entry
+        entry[3 + self._FIELDS.index(field)] = value
+        self._updated[path] = entry
+
+    def get_statistics(self):
+        return ", ".join(f"{field} (hit: {hit}, miss: {miss})" for field, (hit, miss) in self._counter.items()
+                         if hit or miss)
+
+
+class MatchResultCache:
+    # Results of the binary DB kept across runs, by get_cache_key() of the inputs of the lookup.
+    # A result expires ttl seconds after it was looked up, and the least recently used ones are removed over max_entries.
+    def __init__(self, db_file, cold=False, ttl=MATCH_RESULT_TTL, max_entries=MATCH_RESULT_MAX_ENTRIES):
+        self.db_file = db_file
+        self.cold = cold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._updated = {}  # key : [value, tlsh, created]
+        self._used = set()
+        self.hit = 0
+        self.miss = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("CREATE TABLE IF NOT EXISTS match_result (key TEXT PRIMARY KEY, value BLOB, tlsh TEXT, "
+                     "created REAL, last_used REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS match_result_last_used ON match_result (last_used)")
+        return conn
+
+    def get_many(self, keys):
+        # Return {key: (value, tlsh)} of the keys found and not expired.
+        found = {}
+        keys = list(keys)
+        if self.db_file and not self.cold and os.path.isfile(self.db_file):
+            try:
+                conn = self._connect()
+                try:
+                    expire_time = time.time() - self.ttl
+                    for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+                        chunk = keys[start:start + SQLITE_MAX_PARAMS]
+                        for key, value, tlsh_value in conn.execute(
+                                f"SELECT key, value, tlsh FROM match_result WHERE key IN ({','.join('?' * len(chunk))}) "
+                                "AND created >= ?", chunk + [expire_time]):
+                            found[key] = (pickle.loads(value), tlsh_value)
+                finally:
+                    conn.close()
+            except Exception as error:
+                logger.debug(f"Failed to read the match result cache:{error}")
+                found = {}
+        self._used.update(found)
+        self.hit += len(found)
+        self.miss += len(keys) - len(found)
+        return found
+
+    def get_statistics(self):
+        total = self.hit + self.miss
+        return f"hit: {self.hit}, miss: {self.miss}" + (f", hit rate: {self.hit / total:.0%}" if total else "")
+
+    def set(self, key, value, tlsh_value=""):
+        self._updated[key] = [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), tlsh_value, time.time()]
+
+    def save(self):
+        if not self.db_file or not (self._updated or self._used):
+            return
+        try:
+            now = time.time()
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO match_result VALUES (?, ?, ?, ?, ?)",
+                                     [[key] + values + [now] for key, values in self._updated.items()])
+                    conn.executemany("UPDATE match_result SET last_used = ? WHERE key = ?",
+                                     [(now, key) for key in self._used])
+                    conn.execute("DELETE FROM match_result WHERE created < ?", (now - self.ttl,))
+                    conn.execute("DELETE FROM match_result WHERE key IN (SELECT key FROM match_result "
+                                 "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            finally:
+                conn.close()
+            self._updated = {}
+            self._used = set()
+        except Exception as error:
+            logger.warning(f"Failed to write the match result cache:{error}")
@@ -10,7 +10,6 @@ PKG_NAME = "fosslight_android"
 CONST_NULL = ""
 CONST_TLSH_NULL = "0"
 MODULE_INFO_FILE_NAME = "module-info.json"
-MODULE_TYPE_NAME = "MODULE_NAME"
 skip_license = ['Other Proprietary License', 'LGE License', 'LGE Proprietary License']
 NOTICE_FILE_NAME = "NOTICE"
 
@@ -25,6 +24,7 @@ class AndroidBinary:
     notice = ""
     mk_file_path = ""
     tlsh = ""
+    tlsh_calculated = False  # TLSH is only calculated for the binaries that need it.
     checksum = ""
     oss_name = ""
     oss_version = ""
@@ -36,6 +36,7 @@ class AndroidBinary:
     download_location = ""
     homepage = ""
     is_new_bin = True
+    db_match = None  # Result of the binary DB, reused by the binaries of the same file
 
     def __init__(self, value):
         self.bin_name = value
@@ -47,6 +48,7 @@ class AndroidBinary:
         self.notice = CONST_NULL
         self.mk_file_path = CONST_NULL
         self.tlsh = CONST_TLSH_NULL
+        self.tlsh_calculated = False
         self.checksum = CONST_TLSH_NULL
         self.license = CONST_NULL
         self.oss_name = CONST_NULL
@@ -58,6 +60,7 @@ class AndroidBinary:
         self.homepage = ""
         self.additional_oss_items = []
         self.is_new_bin = True
+        self.db_match = None
 
     def set_bin_name(self, value):
         self.bin_name = value
@@ -38,7 +38,31 @@ _HELP_MESSAGE_ANDROID = """
     -f                     Print result of find command for binaries that cannot
                            find a source code path
     -i                     Disable automatic OSS name conversion based on AOSP
-    -r <result.txt>        result.txt file with a list of binaries to remove
+    -r <result.txt>        result.txt file with a list of binaries to remove.
+                           Create it with -t, so that binaries are compared
+                           by TLSH as well as by checksum
+    -l                     Find binaries from the installed-files lists of the build
+                           (installed-files*.json/txt) instead of searching all files
+                           in the build output path
+    -c                     Ignore the cached results of previous scans (cold run)
+                           and rebuild the cache (fosslight_android_cache/)
+    -t                     Calculate TLSH of all binaries. By default, it is only
+                           calculated for binaries that are not matched by checksum.
+                           Use it for a scan whose result.txt will be used with -r
+    -d <dsn>               Connection string of the binary DB
+                           (ex. "host=localhost dbname=bat user=... password=...")
+                           Default: FOSSLIGHT_ANDROID_DB_DSN environment variable
+    -x <file>              Export the android rows of the binary DB to a local SQLite
+                           file and exit. An existing file is refreshed with the rows
+                           updated since the last export (-c: export all rows again)
+    -b <file>              Look up binaries in the file exported by -x instead of
+                           connecting to the binary DB
+    -k <num>               Look up the binary DB on <num> asynchronous connections
+                           with pipelined queries, instead of one connection per
+                           core (requires psycopg 3: pip install fosslight_android[async])
+    -g                     Fetch the repository list of android.googlesource.com when
+                           the source has no repo manifest of AOSP (cached for a day).
+                           By default, the list in the package is used
 
     💡 Examples
     ────────────────────────────────────────────────────────────────────
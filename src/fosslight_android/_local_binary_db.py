@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Local SQLite mirror of the binary DB, for scans without access to it.
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import json
+import logging
+import os
+import sqlite3
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+LOCAL_DB_VERSION = 1
+EXPORT_FETCH_SIZE = 10000
+# Columns of lgematching kept in the mirror, i.e. the columns read by the lookup queries.
+MIRROR_COLUMNS = ['filename', 'pathname', 'checksum', 'tlshchecksum', 'ossname', 'ossversion', 'license', 'platformname',
+                  'platformversion', 'sourcepath', 'updatedate']
+# Rows with the same values of these columns, e.g. the OSS of a binary, are refreshed together.
+_ROW_KEY_COLUMNS = ['filename', 'pathname', 'checksum', 'tlshchecksum', 'sourcepath', 'platformversion']
+_ROW_KEY_INDEXES = [MIRROR_COLUMNS.index(column) for column in _ROW_KEY_COLUMNS]
+_UPDATE_DATE_INDEX = MIRROR_COLUMNS.index('updatedate')
+
+SQL_EXPORT = f"SELECT {','.join(MIRROR_COLUMNS)} FROM lgematching WHERE lower(platformname) = %(platform_name)s"
+SQL_EXPORT_UPDATED = f"{SQL_EXPORT} AND updatedate >= %(updatedate)s"
+SQL_EXPORT_BY_NAMES = f"{SQL_EXPORT} AND (filename = ANY(%(fnames)s::text[]) OR (%(null_name)s AND filename IS NULL))"
+
+# Same results as the queries of _binary_db_controller. The keys are passed as a JSON array instead of arrays of text.
+_SQL_SELECT = "SELECT filename, pathname, checksum, tlshchecksum, ossname, ossversion, license, platformname, " \
+              "platformversion FROM lgematching"
+LOCAL_STATEMENTS = {
+    "fl_select_by_checksum": f"{_SQL_SELECT} WHERE (filename, checksum) IN "
+                             "(SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?))",
+    "fl_select_tlsh_candidates": "SELECT filename, tlshchecksum, sourcepath, lower(platformname), platformversion, updatedate "
+                                 "FROM lgematching WHERE filename IN (SELECT value FROM json_each(?)) AND tlshchecksum <> '0'",
+    "fl_select_by_tlsh": f"{_SQL_SELECT} WHERE (filename, tlshchecksum) IN "
+                         "(SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?))"
+}
+
+
+def get_local_params(params):
+    # {'fnames': [...], 'values': [...]} of the PostgreSQL queries -> one JSON parameter
+    if 'values' in params:
+        return [json.dumps(list(zip(params['fnames'], params['values'])))]
+    return [json.dumps(params['fnames'])]
+
+
+def connect_local_db(local_db_file):
+    conn = sqlite3.connect(f"file:{local_db_file}?mode=ro", uri=True)
+    version = conn.execute("SELECT value FROM mirror_info WHERE key = 'version'").fetchone()
+    if version is None or int(version[0]) != LOCAL_DB_VERSION:
+        conn.close()
+        raise ValueError(f"{local_db_file} isn't a binary DB mirror of version {LOCAL_DB_VERSION}. Export it again.")
+    return conn
+
+
+def _to_local_value(value):
+    # updatedate is compared as text, which sorts the same as the timestamp in ISO format.
+    if hasattr(value, "isoformat"):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _create_tables(conn):
+    conn.execute(f"CREATE TABLE lgematching ({', '.join(f'{column} TEXT' for column in MIRROR_COLUMNS)})")
+    conn.execute("CREATE INDEX lgematching_filename_checksum ON lgematching (filename, checksum)")
+    conn.execute("CREATE INDEX lgematching_filename_tlshchecksum ON lgematching (filename, tlshchecksum)")
+    conn.execute("CREATE TABLE mirror_info (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO mirror_info VALUES ('version', ?)", (str(LOCAL_DB_VERSION),))
+
+
+def _get_last_update_date(local_db_file):
+    # Return the latest updatedate of the mirror, or None if it has to be exported again from the beginning.
+    if not os.path.isfile(local_db_file):
+        return None
+    try:
+        conn = connect_local_db(local_db_file)
+        try:
+            row = conn.execute("SELECT value FROM mirror_info WHERE key = 'updatedate'").fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+    except Exception as error:
+        logger.info(f"Export the binary DB again:{error}")
+    return None
+
+
+def _iter_rows(source_conn, sql_query, params):
+    with source_conn.cursor(name="fl_export_binary_db") as cur:  # Streamed by a server-side cursor
+        cur.itersize = EXPORT_FETCH_SIZE
+        cur.execute(sql_query, params)
+        while True:
+            rows = cur.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            yield [[_to_local_value(value) for value in row] for row in rows]
+
+
+def _get_row_key(row):
+    return tuple(row[idx] for idx in _ROW_KEY_INDEXES)
+
+
+def _refresh_rows(conn, source_conn, platform_name, keys):
+    # Replace the rows of the keys with all their rows in the binary DB, not only with the updated ones.
+    # Return the number of rows copied.
+    refreshed = 0
+    deleted = set()
+    file_names = sorted({key[0] for key in keys if key[0] is not None})
+    batches = [file_names[start:start + EXPORT_FETCH_SIZE] for start in range(0, len(file_names), EXPORT_FETCH_SIZE)]
+    null_name = any(key[0] is None for key in keys)  # Looked up with the first batch
+    for batch_idx, names in enumerate(batches or [[]]):
+        params = {'platform_name': platform_name, 'fnames': names, 'null_name': null_name and batch_idx == 0}
+        for rows in _iter_rows(source_conn, SQL_EXPORT_BY_NAMES, params):
+            rows = [row for row in rows if _get_row_key(row) in keys]
+            new_keys = {_get_row_key(row) for row in rows} - deleted
+            conn.executemany(f"DELETE FROM lgematching WHERE "
+                             f"{' AND '.join(f'{column} IS ?' for column in _ROW_KEY_COLUMNS)}", new_keys)
+            deleted.update(new_keys)
+            conn.executemany(f"INSERT INTO lgematching VALUES ({', '.join('?' * len(MIRROR_COLUMNS))})", rows)
+            refreshed += len(rows)
+    return refreshed
+
+
+def export_binary_db(local_db_file, source_conn, platform_name, full_export=False):
+    # Copy the rows of the platform into local_db_file. If it was exported before, only the rows with the same key as
+    # the rows updated since the latest updatedate of the mirror are copied again, unless full_export is set.
+    # Rows deleted from the binary DB are only removed by a full export.
+    last_update_date = None if full_export else _get_last_update_date(local_db_file)
+    if last_update_date is None:
+        target_file = f"{local_db_file}.{os.getpid()}.tmp"
+        if os.path.exists(target_file):
+            os.remove(target_file)
+        sql_query, params = SQL_EXPORT, {'platform_name': platform_name}
+    else:
+        target_file = local_db_file
+        sql_query, params = SQL_EXPORT_UPDATED, {'platform_name': platform_name, 'updatedate': last_update_date}
+
+    exported = 0
+    latest = last_update_date
+    updated_keys = set()
+    conn = sqlite3.connect(target_file)
+    try:
+        with conn:
+            if last_update_date is None:
+                _create_tables(conn)
+            for rows in _iter_rows(source_conn, sql_query, params):
+                if last_update_date is None:
+                    conn.executemany(f"INSERT INTO lgematching VALUES ({', '.join('?' * len(MIRROR_COLUMNS))})", rows)
+                    exported += len(rows)
+                else:
+                    updated_keys.update(_get_row_key(row) for row in rows)
+                dates = [row[_UPDATE_DATE_INDEX] for row in rows if row[_UPDATE_DATE_INDEX] is not None]
+                if dates:
+                    latest = max(dates + ([latest] if latest is not None else []))
+            if updated_keys:
+                exported = _refresh_rows(conn, source_conn, platform_name, updated_keys)
+            if latest is not None:
+                conn.execute("INSERT OR REPLACE INTO mirror_info VALUES ('updatedate', ?)", (latest,))
+    except Exception:
+        conn.close()
+        if target_file != local_db_file:
+            os.remove(target_file)
+        raise
+    conn.close()
+    if target_file != local_db_file:
+        os.replace(target_file, local_db_file)
+    if last_update_date is None:
+        logger.info(f"Exported {exported} rows of the binary DB to {local_db_file}")
+    else:
+        logger.info(f"Refreshed {exported} rows of {local_db_file} updated since {last_update_date}")
+    return exported
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import os
+import sys
+import json
+import codecs
+import hashlib
+from ._cache import (
+    get_cache_key,
+    get_file_sha1,
+    load_cache_object,
+    save_cache_object
+)
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+READ_CHUNK_SIZE = 1 << 20
+MODULE_INFO_CACHE_VERSION = 2
+_JSON_WHITESPACE = " \t\r\n"
+
+
+class ModuleInfoIndex:
+    # Lookup tables of module-info.json, built once so that each binary is mapped in constant time.
+    # Only "path" and "installed" of each module are used, so the rest of module-info.json isn't kept.
+    def __init__(self, build_out_path):
+        self.out_prefix = build_out_path.rstrip("/") + "/"
+        self.names = []  # module name by order in module-info.json
+        self.source_paths = []  # tuple of "path" by order in module-info.json
+        self.modules = {}  # module name : order
+        self.installed_path = {}  # installed path : order of module
+        self.out_relative_path = {}  # installed path relative to the build output path : order of module
+
+    def __len__(self):
+        return len(self.modules)
+
+    def add(self, name, value):
+        # A module name found again replaces the earlier one as json.load() did, with its own order and paths.
+        order = len(self.names)
+        self.modules[name] = order
+        self.names.append(name)
+        self.source_paths.append(tuple(sys.intern(path) for path in value.get("path") or []))
+
+        for installed in value.get("installed") or []:
+            if installed not in self.installed_path:  # The first module wins as it did in a linear search.
+                self.installed_path[installed] = order
+            if installed.startswith(self.out_prefix):
+                relative_path = installed[len(self.out_prefix):]
+                if relative_path not in self.out_relative_path:
+                    self.out_relative_path[relative_path] = order
+
+    def find(self, module_name, binary_name_with_path, binary_name_only):
+        # Return (module name, tuple of source paths), or None if the binary isn't in module-info.json.
+        if module_name == "" or binary_name_with_path == "":
+            return None
+
+        if module_name in self.modules:  # Binary Name without extension
+            order = self.modules[module_name]
+        elif binary_name_only in self.modules:  # Binary Name
+            order = self.modules[binary_name_only]
+        else:  # Find binary by installed path
+            found = [item for item in (self.installed_path.get(binary_name_with_path),
+                                       self.out_relative_path.get(binary_name_with_path)) if item is not None]
+            if not found:
+                return None
+            order = min(found)
+        return self.names[order], self.source_paths[order]
+
+
+def iter_json_object_items(f, digest=None):
+    # Yield (key, value) of the top-level JSON object of a binary file one by one, without reading it all at once.
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+    state = "start"
+    key = ""
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+            pos += 1
+        try:
+            if pos >= len(buffer):
+                raise EOFError()
+            ch = buffer[pos]
+            if state == "start":
+                if ch != "{":
+                    raise ValueError(f"JSON object is expected at {pos}")
+                pos += 1
+                state = "first_key"
+            elif state in ["first_key", "key"]:
+                if ch == "}" and state == "first_key":
+                    break
+                key, end = decoder.raw_decode(buffer, pos)
+                if end >= len(buffer) and not eof:
+                    raise EOFError()
+                if not isinstance(key, str):
+                    raise ValueError(f"JSON key is expected at {pos}")
+                pos = end
+                state = "colon"
+            elif state == "colon":
+                if ch != ":":
+                    raise ValueError(f"':' is expected at {pos}")
+                pos += 1
+                state = "value"
+            elif state == "value":
+                value, end = decoder.raw_decode(buffer, pos)
+                if end >= len(buffer) and not eof:  # A value at the end of buffer may be cut.
+                    raise EOFError()
+                pos = end
+                state = "next"
+                yield key, value
+            else:
+                if ch == "}":
+                    break
+                if ch != ",":
+                    raise ValueError(f"',' or '}}' is expected at {pos}")
+                pos += 1
+                state = "key"
+        except (EOFError, json.JSONDecodeError):
+            if eof:
+                raise ValueError("Unexpected end of JSON")
+            chunk = f.read(READ_CHUNK_SIZE)
+            if digest is not None:
+                digest.update(chunk)
+            if chunk:
+                text = text_decoder.decode(chunk)
+            else:
+                eof = True
+                text = text_decoder.decode(b"", final=True)
+            buffer = buffer[pos:] + text
+            pos = 0
+
+    if digest is not None:  # Hash the rest of the file as well.
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+def read_module_info(module_info_json_file, build_out_path):
+    index = ModuleInfoIndex(build_out_path)
+    sha1_hash = hashlib.sha1()
+    with open(module_info_json_file, "rb") as f:
+        for name, value in iter_json_object_items(f, sha1_hash):
+            if isinstance(value, dict):
+                index.add(name, value)
+    return index, sha1_hash.hexdigest()
+
+
+def load_module_info(module_info_json_file, build_out_path):
+    # The index is cached by size, mtime and sha1 of module-info.json, so a rescan of the same build skips parsing it.
+    cache_name = f"module_info_{get_cache_key(os.path.abspath(module_info_json_file), build_out_path.rstrip('/'))}.pickle"
+    file_stat = os.stat(module_info_json_file)
+
+    cached = load_cache_object(cache_name)
+    if cached and cached.get("version") == MODULE_INFO_CACHE_VERSION and cached.get("size") == file_stat.st_size:
+        if cached.get("mtime_ns") == file_stat.st_mtime_ns:
+            logger.debug(f"Use the cached index of {module_info_json_file}")
+            return cached["index"]
+        if cached.get("sha1") == get_file_sha1(module_info_json_file):  # Touched, but not changed.
+            cached["mtime_ns"] = file_stat.st_mtime_ns
+            save_cache_object(cache_name, cached)
+            return cached["index"]
+
+    index, sha1_value = read_module_info(module_info_json_file, build_out_path)
+    save_cache_object(cache_name, {"version": MODULE_INFO_CACHE_VERSION, "size": file_stat.st_size,
+                                   "mtime_ns": file_stat.st_mtime_ns, "sha1": sha1_value, "index": index})
+    return index
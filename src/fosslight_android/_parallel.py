@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import os
+import time
+import importlib
+import multiprocessing
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+BROADCAST_TIMEOUT = 120  # seconds
+
+stage_running_time = {}  # stage name : seconds
+worker_busy_time = {}  # stage name : {worker pid : seconds}
+_pool = None  # Worker pool shared by all stages of a scan
+_pool_size = 0
+_barrier = None  # Set in each worker by _init_worker
+_shared_data = {}  # module name : {global variable name : value}, sent to the workers by share_data()
+
+
+def split_list(input_list, num):
+    # Contiguous chunks whose sizes differ by at most one, like numpy.array_split.
+    num = max(1, min(num, len(input_list)))
+    size, remainder = divmod(len(input_list), num)
+    chunks = []
+    start = 0
+    for idx in range(num):
+        end = start + size + (1 if idx < remainder else 0)
+        chunks.append(input_list[start:end])
+        start = end
+    return chunks
+
+
+def split_list_by_weight(input_list, weights, num):
+    # Heaviest items first, packed into about num bundles of similar total weight.
+    # Bundles are pulled by idle workers one by one, so large files don't pile up on one worker at the end.
+    order = sorted(range(len(input_list)), key=lambda idx: weights[idx], reverse=True)
+    target = max(1, sum(weights) // max(1, num))
+    chunks = []
+    chunk = []
+    chunk_weight = 0
+    for idx in order:
+        chunk.append(input_list[idx])
+        chunk_weight += weights[idx]
+        if chunk_weight >= target:
+            chunks.append(chunk)
+            chunk = []
+            chunk_weight = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def apply_changes(input_list, changed_list):
+    # changed_list: [(index of input_list, {attribute name: value})]
+    for idx, changes in changed_list:
+        item = input_list[idx]
+        for key, value in changes.items():
+            setattr(item, key, value)
+
+
+def _set_module_variables(shared_data):
+    for module_name, variables in shared_data.items():
+        module = importlib.import_module(module_name)
+        for name, value in variables.items():
+            setattr(module, name, value)
+
+
+def _init_worker(barrier, shared_data):
+    global _barrier
+    _barrier = barrier
+    _set_module_variables(shared_data)
+
+
+def _receive_shared_data(shared_data):
+    _set_module_variables(shared_data)
+    # Hold this worker until all the others have received the data, so that every worker gets exactly one copy.
+    _barrier.wait(BROADCAST_TIMEOUT)
+
+
+def start_pool(num_cores):
+    # Start the workers while the parent process is still small. They are reused by every stage until close_pool().
+    global _pool, _pool_size
+    close_pool()
+    try:
+        _pool_size = max(1, num_cores)
+        _pool = multiprocessing.Pool(processes=_pool_size, initializer=_init_worker,
+                                     initargs=(multiprocessing.Barrier(_pool_size), _shared_data))
+    except Exception as error:
+        logger.warning(f"Failed to start the worker pool:{error}")
+        _pool = None
+
+
+def close_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool.join()
+        _pool = None
+
+
+def share_data(module_name, **variables):
+    # Set read-only global variables of the module in the workers once, instead of sending them with every task.
+    global _pool
+    _shared_data.setdefault(module_name, {}).update(variables)
+    if _pool is None:
+        return
+    try:
+        _pool.map(_receive_shared_data, [{module_name: variables}] * _pool_size, chunksize=1)
+    except Exception as error:
+        # Stages fall back to a pool per stage, which is started with all the shared data.
+        logger.warning(f"Failed to send data to the workers:{error}")
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+
+
+def _run_in_each_worker(func):
+    result = func()
+    # Hold this worker until all the others have run func, so that func runs exactly once in every worker.
+    _barrier.wait(BROADCAST_TIMEOUT)
+    return result
+
+
+def collect_from_workers(func):
+    # Return [func()] of every worker of the shared pool, e.g. statistics kept in the workers.
+    # Without the shared pool, the workers of each stage have already exited, so nothing is collected.
+    if _pool is None:
+        return []
+    try:
+        return _pool.map(_run_in_each_worker, [func] * _pool_size, chunksize=1)
+    except Exception as error:
+        logger.warning(f"Failed to collect data from the workers:{error}")
+    return []
+
+
+def _imap(func, input_list, num_processes, chunksize=1, ordered=True):
+    if _pool is not None:
+        pool = _pool
+    else:
+        pool = multiprocessing.Pool(processes=num_processes, initializer=_init_worker, initargs=(None, _shared_data))
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(func, input_list, chunksize)
+    finally:
+        if pool is not _pool:
+            pool.terminate()
+
+
+def _run_task(func_and_chunk):
+    func, chunk = func_and_chunk
+    start_time = time.perf_counter()
+    changed_list = func(chunk)
+    return os.getpid(), time.perf_counter() - start_time, changed_list
+
+
+def map_in_parallel(func, input_list, num_cores):
+    # Return [func(item) for item in input_list], calculated by the workers.
+    return list(_imap(func, input_list, max(1, min(num_cores, len(input_list)))))
+
+
+def run_in_parallel(func, input_list, num_cores, stage="", weight=None, chunks_per_worker=1):
+    # func receives a list of (index, item) and returns [(index, {attribute name: value})] of the changed fields only.
+    # The changes are applied to the items of input_list in place.
+    # With weight (item -> cost, e.g. file size), items are scheduled by the cost instead of by the count.
+    start_time = time.time()
+    busy_time = worker_busy_time.setdefault(stage, {}) if stage else {}
+    if input_list:
+        indexed_list = list(enumerate(input_list))
+        num_chunks = max(1, num_cores) * chunks_per_worker
+        if weight is None:
+            chunks = split_list(indexed_list, num_chunks)
+        else:
+            chunks = split_list_by_weight(indexed_list, [weight(item) for item in input_list], num_chunks)
+        tasks = [(func, chunk) for chunk in chunks]
+        from tqdm import tqdm
+        for pid, busy, changed_list in tqdm(_imap(_run_task, tasks, min(num_cores, len(chunks)), ordered=False),
+                                            total=len(chunks), desc=stage or None):
+            busy_time[pid] = busy_time.get(pid, 0) + busy
+            apply_changes(input_list, changed_list)
+
+    if stage:
+        record_stage_time(stage, len(input_list), time.time() - start_time)
+    return input_list
+
+
+def record_stage_time(stage, num_items, elapsed):
+    stage_running_time[stage] = stage_running_time.get(stage, 0) + elapsed
+    logger.info(f"{stage}: {num_items} items, {elapsed:.2f}s")
+
+
+def get_stage_running_time():
+    return ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stage_running_time.items())
+
+
+def get_worker_utilization():
+    # Busy time of each worker over the running time of the stage, e.g. "Checksum (pid 101: 98%, pid 102: 95%)"
+    utilization = []
+    for stage, busy_time in worker_busy_time.items():
+        elapsed = stage_running_time.get(stage, 0)
+        if busy_time and elapsed > 0:
+            workers = ", ".join(f"pid {pid}: {min(busy / elapsed, 1):.0%}" for pid, busy in sorted(busy_time.items()))
+            utilization.append(f"{stage} ({workers})")
+    return ", ".join(utilization)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Repositories and platform revision of the repo manifest of an Android source.
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import glob
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from ._cache import (
+    get_cache_key,
+    load_cache_object,
+    save_cache_object
+)
+from ._repository_index import RepositoryIndex
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+REPO_MANIFEST_CACHE_VERSION = 1
+AOSP_REVIEW_HOST = "android-review.googlesource.com"
+_REVISION_TAGS = ['default', 'superproject', 'project']  # The platform revision is taken from them in this order.
+
+
+def _normalize_manifest_revision(rev):
+    if not rev:
+        return ''
+    r = rev.strip()
+    for prefix in ('refs/tags/', 'refs/heads/'):
+        if r.startswith(prefix):
+            r = r[len(prefix):]
+    if r.startswith('android-'):
+        r = r[len('android-'):]
+    # e.g. 12.1.0_r5 -> 12.1.0 (drop AOSP tag revision suffix)
+    r = re.sub(r'_r\d+$', '', r, flags=re.IGNORECASE)
+    return r
+
+
+def _iter_manifest_elements(manifest_file):
+    # Yield (tag, attributes) of the elements under <manifest>, streamed without building the tree.
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(manifest_file, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
+            elif depth == 2:
+                yield elem.tag, elem.attrib
+        else:
+            depth -= 1
+            if depth == 1:
+                root.clear()
+
+
+def _add_revision(revisions, tag, attrib):
+    # Keep the first revision of each tag of remote="aosp".
+    if tag in _REVISION_TAGS and tag not in revisions and attrib.get('remote') == 'aosp':
+        revision = _normalize_manifest_revision(attrib.get('revision'))
+        if revision:
+            revisions[tag] = revision
+
+
+def _get_platform_revision(revisions):
+    return next((revisions[tag] for tag in _REVISION_TAGS if tag in revisions), '')
+
+
+def read_repo_manifest(android_root):
+    # Read .repo/manifest.xml with the manifests it includes, .repo/local_manifests/*.xml and .repo/project.list.
+    # Return (RepositoryIndex of the projects or None if the manifest isn't of aosp, platform revision, files read).
+    repo_dir = os.path.join(android_root, ".repo")
+    manifests_dir = os.path.join(repo_dir, "manifests")
+    local_manifests_dir = os.path.join(repo_dir, "local_manifests")
+    files_read = []
+    projects = {}  # path : name
+    revisions = {}  # tag : platform revision
+    is_aosp = False
+
+    def read_manifest(manifest_file, include_dir):
+        nonlocal is_aosp
+        manifest_file = os.path.realpath(manifest_file)
+        if manifest_file in files_read or not os.path.isfile(manifest_file):
+            return
+        files_read.append(manifest_file)
+        try:
+            for tag, attrib in _iter_manifest_elements(manifest_file):
+                if tag == "include":
+                    read_manifest(os.path.join(include_dir, attrib.get("name", "")), include_dir)
+                elif tag == "remote":
+                    if AOSP_REVIEW_HOST in attrib.get("review", ""):
+                        is_aosp = True
+                elif tag == "project":
+                    name = attrib.get("name", "")
+                    projects[attrib.get("path") or name] = name
+                elif tag == "remove-project":
+                    for path, name in list(projects.items()):
+                        if name == attrib.get("name") or path == attrib.get("path"):
+                            del projects[path]
+                _add_revision(revisions, tag, attrib)
+        except (ET.ParseError, OSError) as error:
+            logger.debug(f"Failed to read the manifest {manifest_file}:{error}")
+
+    read_manifest(os.path.join(repo_dir, "manifest.xml"), manifests_dir)
+    for local_manifest in sorted(glob.glob(os.path.join(local_manifests_dir, "*.xml"))):
+        read_manifest(local_manifest, local_manifests_dir)
+
+    project_list_file = os.path.join(repo_dir, "project.list")
+    if os.path.isfile(project_list_file):  # Paths of the projects that are checked out
+        files_read.append(project_list_file)
+        try:
+            with open(project_list_file, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    path = line.strip()
+                    if path:
+                        projects.setdefault(path, "")
+        except OSError as error:
+            logger.debug(f"Failed to read {project_list_file}:{error}")
+
+    platform_revision = _get_platform_revision(revisions)
+    if not platform_revision:  # The other manifests of .repo/manifests, e.g. if .repo/manifest.xml doesn't exist.
+        for manifest_file in sorted(glob.glob(os.path.join(manifests_dir, "*.xml"))):
+            manifest_file = os.path.realpath(manifest_file)
+            if manifest_file in files_read:
+                continue
+            files_read.append(manifest_file)
+            file_revisions = {}
+            try:
+                for tag, attrib in _iter_manifest_elements(manifest_file):
+                    _add_revision(file_revisions, tag, attrib)
+            except (ET.ParseError, OSError):
+                continue
+            platform_revision = _get_platform_revision(file_revisions)
+            if platform_revision:
+                break
+
+    repository_index = RepositoryIndex(dict.fromkeys(projects, "")) if is_aosp else None
+    return repository_index, platform_revision, files_read
+
+
+def _get_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def load_repo_manifest(android_root):
+    # Same as read_repo_manifest(), cached by mtime of the files read and of the directories they are in,
+    # so that an added or removed local manifest is found as well.
+    android_root = os.path.abspath(android_root)
+    repo_dir = os.path.join(android_root, ".repo")
+    directories = [repo_dir, os.path.join(repo_dir, "manifests"), os.path.join(repo_dir, "local_manifests")]
+    cache_name = f"repo_manifest_{get_cache_key(android_root)}.pickle"
+
+    cached = load_cache_object(cache_name)
+    if cached and cached.get("version") == REPO_MANIFEST_CACHE_VERSION and \
+            _get_mtimes(cached["mtimes"]) == cached["mtimes"]:
+        logger.debug(f"Use the cached repo manifest of {android_root}")
+        return cached["repository_index"], cached["platform_revision"]
+
+    mtimes = _get_mtimes(directories)
+    repository_index, platform_revision, files_read = read_repo_manifest(android_root)
+    mtimes.update(_get_mtimes(files_read))
+    save_cache_object(cache_name, {"version": REPO_MANIFEST_CACHE_VERSION, "mtimes": mtimes,
+                                   "repository_index": repository_index, "platform_revision": platform_revision})
+    return repository_index, platform_revision
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import os
+import time
+from ._cache import (
+    get_cache_key,
+    load_cache_object,
+    save_cache_object
+)
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+REPOSITORY_INDEX_CACHE_VERSION = 1
+WEB_REPOSITORY_CACHE_NAME = "repository_index_web.pickle"
+WEB_REPOSITORY_TTL = 24 * 60 * 60  # seconds. The repository list of the web is fetched again after a day.
+_REPOSITORY = None  # Key of (repository, link) in a node of the trie. Path components are always str.
+
+
+class RepositoryIndex:
+    # Trie of the path components of the repositories, so that the longest repository containing a source path
+    # is found by walking down the components once instead of looking up each of its prefixes.
+    def __init__(self, repositories):
+        self.root = {}
+        self.num_repositories = 0
+        self._found = {}  # source directory : (repository, link) or None, in this run only
+        for repository, link in repositories.items():
+            self.add(repository, link)
+
+    def __len__(self):
+        return self.num_repositories
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_found"] = {}
+        return state
+
+    def add(self, repository, link):
+        node = self.root
+        for component in repository.split("/"):
+            node = node.setdefault(component, {})
+        if _REPOSITORY not in node:
+            self.num_repositories += 1
+        node[_REPOSITORY] = (repository, link)
+
+    def find(self, directory):
+        # Return (repository, link) of the longest repository that directory is in, or None.
+        if directory in self._found:
+            return self._found[directory]
+        found = None
+        node = self.root
+        for component in directory.split("/"):
+            node = node.get(component)
+            if node is None:
+                break
+            found = node.get(_REPOSITORY, found)
+        self._found[directory] = found
+        return found
+
+
+def load_repository_index(source_file, read_repositories):
+    # The index of the repositories read from source_file by read_repositories() is cached by size and mtime
+    # of the file, so the file isn't read again while it's unchanged.
+    try:
+        file_stat = os.stat(source_file)
+    except OSError:
+        return RepositoryIndex(read_repositories())
+
+    cache_name = f"repository_index_{get_cache_key(os.path.abspath(source_file))}.pickle"
+    cached = load_cache_object(cache_name)
+    if cached and cached.get("version") == REPOSITORY_INDEX_CACHE_VERSION and \
+            cached.get("size") == file_stat.st_size and cached.get("mtime_ns") == file_stat.st_mtime_ns:
+        logger.debug(f"Use the cached repositories of {source_file}")
+        return cached["index"]
+
+    index = RepositoryIndex(read_repositories())
+    save_cache_object(cache_name, {"version": REPOSITORY_INDEX_CACHE_VERSION, "size": file_stat.st_size,
+                                   "mtime_ns": file_stat.st_mtime_ns, "index": index})
+    return index
+
+
+def load_web_repository_index(read_repositories):
+    # The index of the repositories fetched by read_repositories() is cached for WEB_REPOSITORY_TTL.
+    cached = load_cache_object(WEB_REPOSITORY_CACHE_NAME)
+    if cached and cached.get("version") == REPOSITORY_INDEX_CACHE_VERSION and \
+            0 <= time.time() - cached.get("time", 0) < WEB_REPOSITORY_TTL:
+        logger.debug("Use the cached repositories of the web")
+        return cached["index"]
+
+    repositories = read_repositories()
+    index = RepositoryIndex(repositories)
+    if repositories:  # A failed fetch is tried again in the next scan.
+        save_cache_object(WEB_REPOSITORY_CACHE_NAME, {"version": REPOSITORY_INDEX_CACHE_VERSION, "time": time.time(),
+                                                      "index": index})
+    return index
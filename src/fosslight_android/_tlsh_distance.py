@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import numpy as np
+import tlsh
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+INVALID_DISTANCE = -1  # Distance to a candidate that isn't a valid TLSH digest
+# Below this, tlsh.diff() that stops at the first match is faster than decoding all candidates.
+VECTORIZE_MIN_CANDIDATES = 1000
+_DIGEST_SIZE = 35  # checksum(1) + L(1) + Q(1) + body(32) bytes
+_DIGEST_HEX_LENGTH = _DIGEST_SIZE * 2  # Without the version prefix, "T1"
+_BODY_START = 3
+_BODY_SIZE = _DIGEST_SIZE - _BODY_START
+_RANGE_LVALUE = 256
+_RANGE_QRATIO = 16
+
+
+def _get_pair_diff(x, y):
+    # Distance of two 2-bit values in the body, as in tlsh.diff()
+    diff = abs(x - y)
+    return 6 if diff == 3 else diff
+
+
+# Body distance of every pair of bytes, i.e. the sum of the distances of their four 2-bit pairs.
+_BYTE_DIFF = np.array([[sum(_get_pair_diff((x >> shift) & 3, (y >> shift) & 3) for shift in (0, 2, 4, 6))
+                        for y in range(256)] for x in range(256)], dtype=np.uint8)
+# Offset of each body byte in the rows of _BYTE_DIFF selected by a query, flattened.
+_BODY_OFFSET = np.arange(_BODY_SIZE, dtype=np.intp) * 256
+
+
+def _mod_diff(x, y, value_range):
+    diff = np.abs(x - y)
+    return np.minimum(diff, value_range - diff)
+
+
+def _decode_header(raw):
+    # checksum, L, Q1 ratio and Q2 ratio. The nibbles of these bytes are swapped in the hex digest.
+    header = raw[..., :_BODY_START].astype(np.int32)
+    header = ((header & 0x0F) << 4) | (header >> 4)
+    return header[..., 0], header[..., 1], header[..., 2] >> 4, header[..., 2] & 0x0F
+
+
+def _get_hex_digest(tlsh_value):
+    if not isinstance(tlsh_value, str):
+        return ""
+    if len(tlsh_value) == _DIGEST_HEX_LENGTH + 2 and tlsh_value[:2] in ("T1", "t1"):
+        return tlsh_value[2:]
+    return tlsh_value
+
+
+def _decode_query(tlsh_value):
+    hex_digest = _get_hex_digest(tlsh_value)
+    try:
+        if len(hex_digest) != _DIGEST_HEX_LENGTH:
+            raise ValueError()
+        return np.frombuffer(bytes.fromhex(hex_digest), dtype=np.uint8)
+    except ValueError:
+        raise ValueError(f"Invalid TLSH: {tlsh_value}")
+
+
+class TlshDigests:
+    # TLSH hex digests decoded into arrays, so that the distances from a digest to all of them are calculated at once.
+    # Decode candidates once and call diff() for each query when the same candidates are compared more than once.
+    def __init__(self, tlsh_values):
+        values = [_get_hex_digest(value) for value in tlsh_values]
+        self.valid = np.fromiter((len(value) == _DIGEST_HEX_LENGTH for value in values), dtype=bool, count=len(values))
+        raw = np.zeros((len(values), _DIGEST_SIZE), dtype=np.uint8)
+        try:  # All digests are decoded at once, unless one of them isn't a hex string.
+            decoded = bytes.fromhex("".join(value for value in values if len(value) == _DIGEST_HEX_LENGTH))
+            raw[self.valid] = np.frombuffer(decoded, dtype=np.uint8).reshape(-1, _DIGEST_SIZE)
+        except ValueError:
+            for idx in np.flatnonzero(self.valid):
+                try:
+                    raw[idx] = np.frombuffer(bytes.fromhex(values[idx]), dtype=np.uint8)
+                except ValueError:
+                    self.valid[idx] = False
+        self.checksum, self.lvalue, self.q1ratio, self.q2ratio = _decode_header(raw)
+        self.body = raw[:, _BODY_START:].astype(np.intp) + _BODY_OFFSET
+
+    def __len__(self):
+        return len(self.valid)
+
+    def diff(self, tlsh_value):
+        # Same values as tlsh.diff(tlsh_value, candidate) for each candidate, or INVALID_DISTANCE.
+        query = _decode_query(tlsh_value)
+        checksum, lvalue, q1ratio, q2ratio = _decode_header(query)
+
+        lvalue_diff = _mod_diff(self.lvalue, lvalue, _RANGE_LVALUE)
+        distance = np.where(lvalue_diff <= 1, lvalue_diff, lvalue_diff * 12)
+        for candidate_qratio, qratio in ((self.q1ratio, q1ratio), (self.q2ratio, q2ratio)):
+            qratio_diff = _mod_diff(candidate_qratio, qratio, _RANGE_QRATIO)
+            distance += np.where(qratio_diff <= 1, qratio_diff, (qratio_diff - 1) * 12)
+        distance += (self.checksum != checksum)
+        distance += _BYTE_DIFF[query[_BODY_START:]].ravel()[self.body].sum(axis=1, dtype=np.int32)
+        return np.where(self.valid, distance, INVALID_DISTANCE)
+
+    def find_first_within(self, tlsh_value, threshold):
+        # Return the index of the first candidate within the threshold, or -1 if there is none.
+        if len(self) == 0:
+            return -1
+        distance = self.diff(tlsh_value)
+        matched = np.flatnonzero((distance != INVALID_DISTANCE) & (distance <= threshold))
+        return int(matched[0]) if len(matched) > 0 else -1
+
+
+def tlsh_diff_many(tlsh_value, candidates):
+    # Same values as [tlsh.diff(tlsh_value, candidate) for candidate in candidates], in one vectorized pass.
+    # Candidates that aren't valid digests get INVALID_DISTANCE.
+    return TlshDigests(candidates).diff(tlsh_value)
+
+
+def find_first_within(tlsh_value, candidates, threshold):
+    # Return the index of the first candidate within the threshold, or -1 if there is none.
+    if len(candidates) >= VECTORIZE_MIN_CANDIDATES:
+        return TlshDigests(candidates).find_first_within(tlsh_value, threshold)
+
+    _decode_query(tlsh_value)
+    for idx, candidate in enumerate(candidates):
+        try:
+            if tlsh.diff(tlsh_value, candidate) <= threshold:
+                return idx
+        except Exception:  # Not a valid digest
+            continue
+    return -1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import tlsh
+from fosslight_util.constant import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+TLSH_THRESHOLD = 120  # Binaries within this distance are regarded as the same.
+TLSH_HEX_LENGTH = 70  # Without the version prefix, "T1"
+_LENGTH_MULT = 12  # The length part of tlsh.diff() is (difference of L) * 12 when it's over 1.
+
+
+def get_tlsh_lvalue(tlsh_value):
+    # Return L (log of the file length) of a TLSH hex digest, or None if it isn't a valid digest.
+    if len(tlsh_value) == TLSH_HEX_LENGTH + 2 and tlsh_value.startswith("T1"):
+        tlsh_value = tlsh_value[2:]
+    if len(tlsh_value) != TLSH_HEX_LENGTH:
+        return None
+    try:
+        return int(tlsh_value[3] + tlsh_value[2], 16)  # The nibbles of each byte are swapped in the hex digest.
+    except ValueError:
+        return None
+
+
+class TlshIndex:
+    # TLSH digests bucketed by L. tlsh.diff() of two digests whose L differ by more than
+    # threshold // 12 is always over the threshold, so only the nearby buckets are compared.
+    def __init__(self, threshold=TLSH_THRESHOLD):
+        self.threshold = threshold
+        self.max_lvalue_diff = threshold // _LENGTH_MULT
+        self.buckets = {}  # L : [tlsh]
+        self._values = set()
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, tlsh_value):
+        if tlsh_value in self._values:
+            return
+        lvalue = get_tlsh_lvalue(tlsh_value)
+        if lvalue is None:
+            logger.debug(f"Invalid TLSH: {tlsh_value}")
+            return
+        self.buckets.setdefault(lvalue, []).append(tlsh_value)
+        self._values.add(tlsh_value)
+
+    def find(self, tlsh_value):
+        # Return the first digest within the threshold, nearest L first, or "" if there is none.
+        lvalue = get_tlsh_lvalue(tlsh_value)
+        if lvalue is None:
+            return ""
+        for lvalue_diff in range(self.max_lvalue_diff + 1):
+            for bucket_lvalue in {(lvalue + lvalue_diff) % 256, (lvalue - lvalue_diff) % 256}:
+                for value in self.buckets.get(bucket_lvalue, []):
+                    if tlsh.diff(tlsh_value, value) <= self.threshold:
+                        return value
+        return ""
@@ -4,11 +4,16 @@
 # SPDX-License-Identifier: Apache-2.0
 import logging
 import os
+import hashlib
+import tlsh
 from datetime import datetime
+from ._common import CONST_TLSH_NULL
 from fosslight_util.constant import LOGGER_NAME
 
 logger = logging.getLogger(LOGGER_NAME)
 
+HASH_CHUNK_SIZE = 1 << 20
+
 
 def read_file(file_name_with_path, read_as_one_line=False):
     encodings = ["latin-1", "utf-8", "utf-16"]
@@ -68,3 +73,44 @@ def get_path_by_using_find(file_list_to_find, build_out_path, result_file, run_c
             write_txt_file(result_file, str_report, run_command_dir)
         except Exception as error:
             logger.error(f"FIND Command:{error}")
+
+
+def get_file_sha1_and_tlsh(file_path, chunk_size=HASH_CHUNK_SIZE, with_tlsh=True):
+    # Read the file once in chunks, so only chunk_size bytes of it are in memory at a time.
+    # Files that fit in a chunk use tlsh.hash() as before. The digests are the same either way.
+    # TLSH is much slower than SHA1, so it is "" unless with_tlsh is set.
+    sha1_hash = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        data = f.read(chunk_size)
+        sha1_hash.update(data)
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return sha1_hash.hexdigest(), tlsh.hash(data) if with_tlsh else ""
+
+        tlsh_hash = tlsh.Tlsh() if with_tlsh else None
+        if tlsh_hash:
+            tlsh_hash.update(data)
+        while chunk:
+            sha1_hash.update(chunk)
+            if tlsh_hash:
+                tlsh_hash.update(chunk)
+            chunk = f.read(chunk_size)
+    if not tlsh_hash:
+        return sha1_hash.hexdigest(), ""
+    try:
+        tlsh_hash.final()
+        tlsh_value = tlsh_hash.hexdigest()
+    except ValueError:  # Not enough variation in the input. tlsh.hash() returns its 'no hash' value instead.
+        tlsh_value = tlsh.hash(b"")
+    return sha1_hash.hexdigest(), tlsh_value
+
+
+def get_file_tlsh(file_path):
+    # Return CONST_TLSH_NULL if the file can't be read or the TLSH can't be calculated.
+    tlsh_value = ""
+    if os.path.isfile(file_path):
+        try:
+            tlsh_value = get_file_sha1_and_tlsh(file_path)[1]
+        except Exception as error:
+            logger.debug(f"get_file_tlsh:{error}")
+    return tlsh_value or CONST_TLSH_NULL
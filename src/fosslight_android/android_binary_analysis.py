@@ -7,54 +7,83 @@
 import sys
 import os
 import re
-import glob
 import json
-import xml.etree.ElementTree as ET
 import logging
 import zipfile
 import shutil
-# Parsing NOTICE
-from bs4 import BeautifulSoup
-import subprocess
-# For tlsh comparison
-import tlsh
-import hashlib
+import time
 # For checking repository name
 import urllib.request
 import multiprocessing
-import parmap
-import numpy as np
-from functools import partial
-from fosslight_util.set_log import init_log
+from functools import lru_cache, partial
 from ._util import (
     read_file,
-    write_txt_file,
+    get_file_sha1_and_tlsh,
     get_path_by_using_find
 )
 from .check_package_file import check_packaging_files
+from ._binary_finder import (
+    find_binary_candidates,
+    find_binary_candidates_from_installed_files
+)
+from ._cache import (
+    FileInventory,
+    INVENTORY_FILE_NAME,
+    MATCH_RESULT_FILE_NAME,
+    MatchResultCache,
+    get_cache_key,
+    get_cache_file,
+    get_file_sha1,
+    init_cache,
+    load_cache_object,
+    save_cache_object
+)
 from .check_notice_file import (
+    GZ_EXTENSION,
     find_bin_in_notice,
+    open_notice_file,
     read_notice_file
 )
-from ._binary_db_controller import get_oss_info_from_db
+from . import _binary_db_controller
+from ._binary_db_controller import (
+    close_connection_pool,
+    export_to_local_db,
+    format_db_statistics,
+    get_db_dsn,
+    get_db_source,
+    get_oss_info_from_db,
+    set_db_match
+)
+from ._async_binary_db import get_oss_info_from_db_async, is_async_db_available
+from ._module_info import load_module_info
+from ._repo_manifest import load_repo_manifest
+from ._repository_index import load_repository_index, load_web_repository_index
+from ._tlsh_index import TlshIndex
+from ._parallel import (
+    apply_changes,
+    close_pool,
+    collect_from_workers,
+    get_stage_running_time,
+    get_worker_utilization,
+    record_stage_time,
+    run_in_parallel,
+    share_data,
+    start_pool
+)
 from ._common import (
     AndroidBinary,
     CONST_NULL,
     CONST_TLSH_NULL,
     MODULE_INFO_FILE_NAME,
-    MODULE_TYPE_NAME,
     skip_license,
     NOTICE_FILE_NAME,
     PKG_NAME
 )
 from ._help import print_help_msg, print_version
 from fosslight_util.constant import LOGGER_NAME
-from fosslight_binary.binary_analysis import return_bin_only
 import argparse
 from pathlib import Path
 from fosslight_util.cover import dump_result_log
-from fosslight_util.oss_item import ScannerItem
-from fosslight_util.output_format import write_output_file
 from fosslight_util.time import current_timestamp_utc, timestamp_for_filename
 
 EXCEPTIONAL_PATH = [r"(/)+gen/META/lic_intermediates/"]
@@ -64,15 +93,21 @@ python_script_dir = ""
 logger = logging.getLogger(LOGGER_NAME)
 
 final_bin_info = []
-module_info_json_obj = {}
+module_info = None  # ModuleInfoIndex of module-info.json
 build_out_path = ""  # ex -out/target/product/generic/
 build_out_notice_file_path = ""  # build out/target/product/generic/obj/NOTICE.html
 notice_file_list = {}  # Save file list in NOTICE.html
 platform_version = ""  # Android Version. ex- 7.0.0.r1 -> 7.0
+file_inventory = None  # File type, checksum and tlsh of the previous scans
+db_statistics = ""  # Connections and queries of the binary DB
+match_result_cache = None  # Results of the binary DB of the previous scans
+match_result_statistics = ""
 
 # Define Const Variables
 ANDROID_LOG_FILE_NAME = "android.log"
 num_cores = 1
+REMOVE_LIST_CACHE_VERSION = 2
+CHUNKS_PER_WORKER = 16  # Small chunks are pulled by idle workers, so they are kept busy until the end of a stage.
 file_time = ""
 HIDDEN_HEADER = {'TLSH', "SHA1"}
 HEADER = {'BIN (Android)': ['ID', 'Binary Path', 'Source Path', 'Notice', 'OSS Name',
@@ -81,7 +116,8 @@ HEADER = {'BIN (Android)': ['ID', 'Binary Path', 'Source Path', 'Notice', 'OSS N
                             'Need Check', 'TLSH', 'SHA1']}
 
 # For checking repository's name
-repositories = {}
+repository_index = None  # RepositoryIndex of the repositories of the manifest, the web or aosp_repository.json
+manifest_repository_index = None  # RepositoryIndex of the projects of the repo manifest, or None if it isn't of aosp
 
 # For checking MODULE_LICENSE* files
 _BASE_DIR = os.path.dirname(__file__)
@@ -91,16 +127,16 @@ _TAG_FILE_TABLE = {}
 meta_lic_files = {}
 
 
-def do_multi_process(func, input_list):
-    manager = multiprocessing.Manager()
-    return_list = manager.list()
-    splited_data = np.array_split(input_list, num_cores)
-    splited_data = [x.tolist() for x in splited_data]
+def do_multi_process(func, input_list, stage="", weight=None, chunks_per_worker=1):
+    # Items of input_list are updated in place with the fields that func returns.
+    return run_in_parallel(func, input_list, num_cores, stage, weight, chunks_per_worker)
 
-    parmap.map(func, splited_data, return_list, pm_pbar=True,
-               pm_processes=num_cores)
 
-    return return_list
+def get_file_size(item):
+    try:
+        return os.path.getsize(item.bin_name_with_installed_path)
+    except OSError:
+        return 0
 
 
 def get_oss_component_name(directory, default_name, default_version):
@@ -108,15 +144,12 @@ def get_oss_component_name(directory, default_name, default_version):
     oss_version = default_version
     repo_link = ""
     try:
-        # Set oss component name as path
-        directories = directory.split('/')
-        for idx in range(len(directories), 0, -1):
-            found_repository = "/".join(directories[0:idx])
-            if found_repository in repositories:
-                final_oss_name = "android-" + found_repository.replace('/', '-')
-                oss_version = platform_version
-                repo_link = repositories.get(found_repository, "")
-                break
+        # Set oss component name as the longest repository that contains the directory
+        found = repository_index.find(directory)
+        if found is not None:
+            found_repository, repo_link = found
+            final_oss_name = "android-" + found_repository.replace('/', '-')
+            oss_version = platform_version
     except Exception as error:
         logger.debug(f"get_oss_component:{error}")
 
@@ -124,7 +157,7 @@ def get_oss_component_name(directory, default_name, default_version):
 
 
 def find_bin_license_info():
-    global final_bin_info, _TAG_FILE_TABLE
+    global _TAG_FILE_TABLE
 
     try:
         with open(_MODULE_LICENSE) as json_file:
@@ -132,45 +165,13 @@ def find_bin_license_info():
         find_meta_lic_files()
     except Exception as error:
         logger.error(f"find_bin_license:{error}")
+    share_data(__name__, _TAG_FILE_TABLE=_TAG_FILE_TABLE, meta_lic_files=meta_lic_files)
 
-    return_list = do_multi_process(find_tag_file, final_bin_info)
-    final_bin_info = return_list[:]
-
-
-def get_module_json_obj_by_installed_path(module_name, binary_name_with_path, binary_name_only):
-
-    if module_name == "" or binary_name_with_path == "":
-        return ""
-
-    js_value = ""
-
-    if module_name in module_info_json_obj:  # Binary Name without extension
-        js_value = module_info_json_obj[module_name]
-        js_value[MODULE_TYPE_NAME] = module_name
-        return js_value
-    elif binary_name_only in module_info_json_obj:  # Binary Name
-        js_value = module_info_json_obj[binary_name_only]
-        js_value[MODULE_TYPE_NAME] = binary_name_only
-        return js_value
-    else:  # Find binary by installed path
-        for key in module_info_json_obj:
-            js_value = module_info_json_obj[key]
-            output_files = js_value.get("installed", None)
-            if output_files is not None:
-                for output_file in output_files:
-                    if output_file == binary_name_with_path:
-                        js_value[MODULE_TYPE_NAME] = key
-                        return js_value
-                    else:
-                        path_with_out_dir = os.path.join(build_out_path, binary_name_with_path)
-                        if path_with_out_dir == output_file:
-                            js_value[MODULE_TYPE_NAME] = key
-                            return js_value
-    return ""
+    do_multi_process(find_tag_file, final_bin_info, "Find license", chunks_per_worker=CHUNKS_PER_WORKER)
 
 
 def read_module_info_from_build_output_file():
-    global module_info_json_obj
+    global module_info
 
     success = True
 
@@ -184,9 +185,8 @@ def read_module_info_from_build_output_file():
         success = False
     try:
         logger.info(f"READ module-info.json :{module_info_json_file}")
-        f = open(module_info_json_file, 'r')
-        module_info_json_obj = json.loads(f.read())
-        f.close()
+        module_info = load_module_info(module_info_json_file, build_out_path)
+        logger.debug(f"Number of modules in module-info.json: {len(module_info)}")
     except Exception as error:
         success = False
         logger.warn(f"[ERROR] Failed to read:{error}")
@@ -195,70 +195,11 @@ def read_module_info_from_build_output_file():
         sys.exit(1)
 
 
-def _normalize_manifest_revision(rev):
-    if not rev:
-        return ''
-    r = rev.strip()
-    for prefix in ('refs/tags/', 'refs/heads/'):
-        if r.startswith(prefix):
-            r = r[len(prefix):]
-    if r.startswith('android-'):
-        r = r[len('android-'):]
-    # e.g. 12.1.0_r5 -> 12.1.0 (drop AOSP tag revision suffix)
-    r = re.sub(r'_r\d+$', '', r, flags=re.IGNORECASE)
-    return r
-
-
-def _revision_from_manifest_root(root):
-    for tag in ('default', 'superproject', 'project'):
-        for elem in root.findall(tag):
-            if elem.get('remote') != 'aosp':
-                continue
-            rev = elem.get('revision')
-            if rev:
-                normalized = _normalize_manifest_revision(rev)
-                if normalized:
-                    return normalized
-    return ''
-
-
-def try_extract_platform_version_from_repo_manifest(android_root):
-    """Prefer platform identity from .repo/manifests (remote=aosp), same scope as grep."""
-    android_root = os.path.abspath(android_root)
-    manifests_dir = os.path.join(android_root, '.repo', 'manifests')
-    if not os.path.isdir(manifests_dir):
-        return ''
-    xml_files = sorted(glob.glob(os.path.join(manifests_dir, '*.xml')))
-    if not xml_files:
-        return ''
-    matched_files = []
-    try:
-        completed = subprocess.run(
-            ['grep', '-l', 'remote="aosp"'] + xml_files,
-            capture_output=True, text=True, timeout=120)
-        if completed.returncode == 0:
-            matched_files = [ln.strip() for ln in completed.stdout.splitlines() if ln.strip()]
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-        matched_files = []
-
-    if not matched_files:
-        matched_files = xml_files
-
-    for xml_path in matched_files:
-        try:
-            tree = ET.parse(xml_path)
-            rev = _revision_from_manifest_root(tree.getroot())
-            if rev:
-                return rev
-        except ET.ParseError:
-            continue
-    return ''
-
-
 def set_env_variables_from_result_log(android_src_path):
-    global build_out_path, build_out_notice_file_path, platform_version
+    global build_out_path, build_out_notice_file_path, platform_version, manifest_repository_index
 
-    pv_manifest = try_extract_platform_version_from_repo_manifest(android_src_path)
+    # The repositories of the manifest are used later by set_oss_name_by_repository().
+    manifest_repository_index, pv_manifest = load_repo_manifest(android_src_path)
     platform_version_source = ""
     if pv_manifest:
         platform_version = pv_manifest
@@ -318,36 +259,20 @@ def set_env_variables_from_result_log(android_src_path):
     read_module_info_from_build_output_file()
 
 
-def find_binaries_from_out_dir():
+def find_binaries_from_out_dir(use_installed_files=False):
     global build_out_path
 
     if build_out_path.endswith("/"):
         build_out_path = build_out_path[:-1]
         build_out_path = build_out_path.strip()
 
-    system_path = os.path.join(build_out_path, "system")
-    root_path = os.path.join(build_out_path, "root")
-    obj_static_lib = os.path.join(build_out_path, "obj/STATIC_LIBRARIES")
-    font_path = os.path.join(build_out_path, "system/fonts")
-    cmd_list = [
-        "find " + system_path + " -type f -exec file \"{}\" \\; | "
-        "egrep \"ELF\\ |ARM,|\\.jar|\\.apk\" | grep -v \"\\.o:\" | "
-        "grep -v \"\\.odex:\" | awk -F\":\" \'{print $1}\'",
-        "find " + root_path + " -type f -exec file \"{}\" \\; | "
-        "egrep \"ELF\\ |ARM,|\\.jar|\\.apk\" | grep -v \"\\.o:\" | awk -F\":\" \'{print $1}\' ",
-        "find " + build_out_path + " -maxdepth 1 -type f -exec file \"{}\" \\; | grep data$ |"
-        " grep -v .img  | awk -F\":\" \'{print $1}\' ",
-        "find " + obj_static_lib + " -type f -exec file \"{}\" \\; | egrep \"ar archive\" | awk -F\":\" \'{print $1}\' ",
-        f"find {build_out_path} ! \\( \\( -type d -path {system_path}"
-        f" -o -path {root_path} -o -path \'{build_out_path}"
-        f"/obj*\' -o -path {build_out_path}/symbols -o -path \'"
-        f"{build_out_path}/factory_*\' -o -path {build_out_path}"
-        "/dex_bootjars \\) -prune \\)  -type f -exec file \"{}\" \\; | egrep \"ELF\\ |ARM,|\\.jar|\\.apk\" | "
-        "grep -v \"\\.o:\" | grep -v \"\\.odex:\" | awk -F\":\" \'{print $1}\' ",
-        "find " + font_path + " -type f -exec file \"{}\" \\; | egrep \"font\" | awk -F\":\" \'{print $1}\'"
-    ]
-
-    return_list = do_multi_process(find_binary, cmd_list)
+    return_list = None
+    if use_installed_files:
+        return_list = find_binary_candidates_from_installed_files(build_out_path, file_inventory)
+        if return_list is None:
+            logger.warning("Can't find an installed-files list. Search all files in the build output path.")
+    if return_list is None:
+        return_list = find_binary_candidates(build_out_path, file_inventory)
     tmp_files = []
     for file_rel_path in return_list:
         if any(re.search(re_except_path, file_rel_path) for re_except_path in EXCEPTIONAL_PATH):
@@ -358,19 +283,12 @@ def find_binaries_from_out_dir():
             bin_item.bin_name_with_installed_path = file_rel_path
             tmp_files.append(bin_item)
 
+    from fosslight_binary.binary_analysis import return_bin_only
     tmp_bin_files = list(return_bin_only(tmp_files, False))
     return_list = [x.bin_name_with_installed_path for x in tmp_bin_files]
     return return_list
 
 
-def find_binary(cmd_list, install_list):
-    for cmd in cmd_list:
-        result = str(subprocess.check_output(cmd, shell=True, universal_newlines=True)).replace('\n', " ")
-        if result is not None:
-            result = result.split()
-            install_list.extend(result)
-
-
 def find_license_from_meta(module_name, bin_name):
     lic = ""
     key = module_name
@@ -381,22 +299,24 @@ def find_license_from_meta(module_name, bin_name):
     return lic
 
 
-def find_tag_file(bin_info_list, return_bin_list):
-    for item in bin_info_list:
+def find_tag_file(bin_info_list):
+    changed_list = []
+    for idx, item in bin_info_list:
         dir_path = item.source_code_path
-        item.license = CONST_NULL
+        license = CONST_NULL
         try:
             module_license_files = [x for x in os.listdir(dir_path) if x.startswith('MODULE_LICENSE_')]
             if module_license_files is not None and len(module_license_files) > 0:
                 for module_license_file in module_license_files:
-                    item.license = module_license_file.replace('MODULE_LICENSE_', '')
-                    if item.license in _TAG_FILE_TABLE:
-                        item.license = _TAG_FILE_TABLE[item.license]
+                    license = module_license_file.replace('MODULE_LICENSE_', '')
+                    if license in _TAG_FILE_TABLE:
+                        license = _TAG_FILE_TABLE[license]
         except Exception:
-            item.license = CONST_NULL
-        if item.license == CONST_NULL:
-            item.license = find_license_from_meta(item.module_name, item.binary_name_without_path)
-    return_bin_list.extend(bin_info_list)
+            license = CONST_NULL
+        if license == CONST_NULL:
+            license = find_license_from_meta(item.module_name, item.binary_name_without_path)
+        changed_list.append((idx, {"license": license}))
+    return changed_list
 
 
 def get_result_of_notice_html(found_on_html, notice_file_found):
@@ -411,11 +331,11 @@ def get_result_of_notice_html(found_on_html, notice_file_found):
 
 
 def find_notice_value(notice_zip_dest_file=""):
-    global notice_file_list, final_bin_info
+    global notice_file_list
     notice_file_comment = "Notice file not found."
 
     try:
-        notice_file_list, notice_files = read_notice_file(os.path.abspath(build_out_notice_file_path))
+        notice_file_list, notice_files = read_notice_file(os.path.abspath(build_out_notice_file_path), num_cores)
         if notice_file_list:
             if notice_files:
                 for notice_file in notice_files:
@@ -432,26 +352,27 @@ def find_notice_value(notice_zip_dest_file=""):
                         notice_file_comment = "Failed to compress the Notice file."
             else:
                 logger.debug("Can't find a notice file to read.")
-            return_list = do_multi_process(find_notice_html, final_bin_info)
-            final_bin_info = return_list[:]
+            share_data(__name__, notice_file_list=notice_file_list)
+            do_multi_process(find_notice_html, final_bin_info, "Find NOTICE")
     except Exception as error:
         logger.debug(f"find_notice_value:{error}")
     logger.info(notice_file_comment)
     return notice_file_comment
 
 
-def find_notice_html(bin_info, return_list):
-    for item in bin_info:
+def find_notice_html(bin_info):
+    changed_list = []
+    for idx, item in bin_info:
         output = ""
         try:
             output = item.bin_name
             check_notice_html = find_bin_in_notice(output, notice_file_list)
             check_notice_file_exist_at_path = os.path.isfile(
                 os.path.join(item.source_code_path, NOTICE_FILE_NAME))
-            item.notice = get_result_of_notice_html(check_notice_html, check_notice_file_exist_at_path)
+            changed_list.append((idx, {"notice": get_result_of_notice_html(check_notice_html, check_notice_file_exist_at_path)}))
         except Exception as error:
             logger.debug(f"find_notice_html error:{error}")
-    return_list.extend(bin_info)
+    return changed_list
 
 
 def map_binary_module_name_and_path(installed_file_list):
@@ -467,32 +388,35 @@ def map_binary_module_name_and_path(installed_file_list):
         else:
             module_name = file_name
 
-        found_json_obj = get_module_json_obj_by_installed_path(module_name, file_name_with_relative_path, file_name)
+        found = module_info.find(module_name, file_name_with_relative_path, file_name)
         bin_info = AndroidBinary(file_name_with_relative_path)
         bin_info.set_bin_name_with_installed_path(out_binary)
-        if found_json_obj != "":
-            if found_json_obj["path"] != "" and len(found_json_obj["path"]) > 0:
-                bin_info.set_source_code_path(found_json_obj["path"][0])
-                bin_info.set_module_name(found_json_obj[MODULE_TYPE_NAME])
-            else:
-                bin_info.set_module_name(found_json_obj[MODULE_TYPE_NAME])
+        if found:
+            found_module_name, source_paths = found
+            if source_paths:
+                bin_info.set_source_code_path(source_paths[0])
+            bin_info.set_module_name(found_module_name)
         else:
             bin_info.set_module_name(module_name)
 
         final_bin_info.append(bin_info)
 
 
-def check_already_exist(bin):
-    items = list(filter(lambda x: x.bin_name is bin, final_bin_info))
-    return len(items) > 0
+@lru_cache(maxsize=None)
+def get_real_path(path):
+    return os.path.realpath(path)
 
 
 def filter_non_path_bin(FIND_DIRECTORY_MODE):
+    global final_bin_info
     filter_file_type = ['.oat', '.art', '.hyb', '.dat', '.xml', '.odex', '.sh']
-    bin_info_list = final_bin_info[:]
+    bin_names = {item.bin_name for item in final_bin_info}
+    real_build_out_path = get_real_path(build_out_path)
+    filtered_binaries = []
     need_to_find = {}
 
-    for item in bin_info_list:
+    for item in final_bin_info:
+        remove = False
         try:
             bin_name = item.bin_name
             path = item.source_code_path
@@ -500,43 +424,26 @@ def filter_non_path_bin(FIND_DIRECTORY_MODE):
             filename, file_extension = os.path.splitext(bin_name)
             if path == CONST_NULL:
                 if file_extension in filter_file_type:
-                    final_bin_info.remove(item)
+                    remove = True
                 elif os.path.islink(output):
-                    real_bin = os.path.realpath(output)
-                    if real_bin is not None:
-                        idx = real_bin.find(build_out_path)
-                        final_bin = real_bin[idx:].replace(build_out_path, '')
-                        if check_already_exist(final_bin):
-                            final_bin_info.remove(item)
+                    # Remove the link if the file it points to is already in the list.
+                    final_bin = os.path.relpath(get_real_path(output), real_build_out_path)
+                    remove = final_bin != bin_name and final_bin in bin_names
                 else:
                     need_to_find[os.path.basename(bin_name)] = []
         except Exception:
             pass
+        if remove:
+            bin_names.discard(item.bin_name)
+        else:
+            filtered_binaries.append(item)
+    final_bin_info = filtered_binaries
 
     if FIND_DIRECTORY_MODE:
         get_path_by_using_find(need_to_find, build_out_path, f"FIND_RESULT_OF_BINARIES_{file_time}.txt", python_script_dir)
 
 
-def search_binaries_by_bin_name_and_checksum(bin_name_to_search, bin_checksum_to_search):
-    bin_list_same_names = []
-    bin_cnt = 0
-    result = False
-    bin_name_without_path = os.path.basename(bin_name_to_search)
-    for item in final_bin_info:
-        bin_name = os.path.basename(item.bin_name)
-        checksum = item.checksum
-        if bin_name == bin_name_without_path and checksum == bin_checksum_to_search:
-            bin_list_same_names.append(item)
-            bin_cnt += 1
-
-    if bin_cnt > 1:
-        result = True
-
-    return result, bin_list_same_names
-
-
-def get_repositories_name_from_json():
-    repositories = {}
+def get_repository_json_file():
     repository_file = os.path.join("resources", "aosp_repository.json")
 
     try:
@@ -544,7 +451,12 @@ def get_repositories_name_from_json():
     except Exception:
         base_dir = os.path.dirname(__file__)
 
-    file_withpath = os.path.join(base_dir, repository_file)
+    return os.path.join(base_dir, repository_file)
+
+
+def get_repositories_name_from_json():
+    repositories = {}
+    file_withpath = get_repository_json_file()
     try:
         with open(file_withpath, 'r') as f:
             repositories = json.load(f)
@@ -555,6 +467,7 @@ def get_repositories_name_from_json():
 
 
 def get_repositories_name_from_web():
+    from bs4 import BeautifulSoup
     repositories = {}
     urls = ["https://android.googlesource.com/platform/", "https://android.googlesource.com/"]
 
@@ -576,32 +489,19 @@ def get_repositories_name_from_web():
     return repositories
 
 
-def get_repositories_name():
-    global repositories
-    success = False
-    repositories = {}
-    remote_is_aosp = False
+def get_repositories_name(fetch_web=False):
+    global repository_index
 
     # Get repository name from manifest first.
-    read_success, manifest_content = read_file(".repo/manifest.xml", True)
-    if read_success:
-        soup = BeautifulSoup(manifest_content, "lxml")
-        for remote_info in soup.findAll("remote"):
-            if str(remote_info['review']).find("android-review.googlesource.com") > -1:  # Only in case of aosp
-                remote_is_aosp = True
-                break
-
-        if remote_is_aosp:
-            for project_item in soup.findAll("project"):
-                repositories[project_item['path']] = ""
-
-    if (not read_success) or (not remote_is_aosp) or repositories is None:  # Get repository name from web.
-        repositories = get_repositories_name_from_web()
-    if len(repositories) == 0:
-        repositories = get_repositories_name_from_json()
-    if len(repositories):
-        success = True
-    return success
+    repository_index = manifest_repository_index
+    if repository_index is None:
+        if fetch_web:  # Get repository name from web.
+            repository_index = load_web_repository_index(get_repositories_name_from_web)
+        else:
+            logger.debug("No repo manifest of aosp. Use the repository list of aosp_repository.json")
+    if repository_index is None or len(repository_index) == 0:
+        repository_index = load_repository_index(get_repository_json_file(), get_repositories_name_from_json)
+    return len(repository_index) > 0
 
 
 def set_mk_file_path():
@@ -620,7 +520,15 @@ def set_mk_file_path():
         item.set_mk_file_path(mk_path)
 
 
+def warn_tlsh_null_in_remove_list(remove_list_file, tlsh_null_count):
+    if tlsh_null_count:
+        logger.warning(f"(-r option) {tlsh_null_count} binaries in {remove_list_file} have no TLSH, "
+                       "so they are removed only if the checksum is the same. "
+                       "Create the list with -t to compare them by TLSH as well.")
+
+
 def remove_from_the_list(remove_list_file):
+    # remove_list: checksum + file name, remove_tlsh_list: file name : TlshIndex
     remove_list = {}
     remove_tlsh_list = {}
     if remove_list_file == "":
@@ -630,8 +538,16 @@ def remove_from_the_list(remove_list_file):
             remove_list_file = os.path.join(python_script_dir, remove_list_file)
 
         if os.path.isfile(remove_list_file):
+            cache_name = f"remove_list_{get_file_sha1(remove_list_file)}.pickle"
+            cached = load_cache_object(cache_name)
+            if cached and cached.get("version") == REMOVE_LIST_CACHE_VERSION:
+                logger.debug(f"Use the cached list of {remove_list_file}")
+                warn_tlsh_null_in_remove_list(remove_list_file, cached["tlsh_null_count"])
+                return cached["remove_list"], cached["remove_tlsh_list"]
+
             read_success, read_line = read_file(remove_list_file)
             if read_success:
+                tlsh_null_count = 0
                 for line in read_line:
                     try:
                         cell_list = line.split("\t")
@@ -640,14 +556,16 @@ def remove_from_the_list(remove_list_file):
                         bin_tlsh = cell_list[8]
                         bin_checksum = cell_list[9].strip()
                         remove_list[bin_checksum + bin_name_to_search] = ""
-                        item = remove_tlsh_list.get(bin_name_to_search)
-                        if item:
-                            item.append(bin_tlsh)
-                        else:
-                            remove_tlsh_list[bin_name_to_search] = [bin_tlsh]
-
+                        if bin_tlsh == CONST_TLSH_NULL:  # TLSH isn't calculated for all binaries unless -t is given.
+                            tlsh_null_count += 1
+                            continue
+                        remove_tlsh_list.setdefault(bin_name_to_search, TlshIndex()).add(bin_tlsh)
                     except Exception as error:
                         logger.error(f"Parsing line :{error}")
+                warn_tlsh_null_in_remove_list(remove_list_file, tlsh_null_count)
+                save_cache_object(cache_name, {"version": REMOVE_LIST_CACHE_VERSION, "remove_list": remove_list,
+                                               "remove_tlsh_list": remove_tlsh_list,
+                                               "tlsh_null_count": tlsh_null_count})
             else:
                 logger.warning(f"Failed to read {remove_list_file}")
         else:
@@ -658,128 +576,239 @@ def remove_from_the_list(remove_list_file):
     return remove_list, remove_tlsh_list
 
 
-def set_checksum_tlsh_and_get_oss_from_db_after_remove_duplication(remove_list_file=""):
-    global final_bin_info
+def set_checksum_tlsh_and_get_oss_from_db_after_remove_duplication(remove_list_file="", all_tlsh=False, db_dsn="",
+                                                                   local_db_file="", db_connections=0):
+    # TLSH is calculated only for binaries compared with the -r list and binaries whose checksum isn't in the binary DB,
+    # unless all_tlsh is set.
+    bin_to_calculate = []
+    for item in final_bin_info:
+        if not get_checksum_tlsh_from_inventory(item) or (all_tlsh and not item.tlsh_calculated):
+            bin_to_calculate.append(item)
+    if bin_to_calculate:
+        stage = "Checksum, TLSH" if all_tlsh else "Checksum"
+        do_multi_process(partial(get_checksum_tlsh, all_tlsh), bin_to_calculate, stage, get_file_size, CHUNKS_PER_WORKER)
+        for item in bin_to_calculate:
+            set_checksum_tlsh_to_inventory(item)
+
+    remove_list, remove_tlsh_list = remove_from_the_list(remove_list_file)
+    bin_to_calculate = [item for item in final_bin_info
+                        if not item.tlsh_calculated and os.path.basename(item.bin_name) in remove_tlsh_list]
+    if bin_to_calculate:
+        do_multi_process(partial(get_checksum_tlsh, True), bin_to_calculate, "TLSH of -r list", get_file_size, CHUNKS_PER_WORKER)
+        for item in bin_to_calculate:
+            set_checksum_tlsh_to_inventory(item)
+    remove_duplicated_binaries_by_checking_checksum(remove_list_file, remove_list, remove_tlsh_list)
+
+    get_oss_from_db(db_dsn, local_db_file, db_connections)
+    for item in final_bin_info:
+        if item.tlsh_calculated:  # Calculated while comparing with the binary DB
+            set_checksum_tlsh_to_inventory(item)
+    if file_inventory:
+        file_inventory.save()
+
 
-    return_list = do_multi_process(get_checksum_tlsh, final_bin_info)
-    final_bin_info = return_list[:]
-    remove_duplicated_binaries_by_checking_checksum(remove_list_file)
+def get_oss_from_db(db_dsn, local_db_file, db_connections=0):
+    # The results of the previous scans are reused for the binaries of the same file and source path.
+    # With db_connections, the binary DB is looked up asynchronously on that many connections instead of by the workers.
+    global db_statistics, match_result_statistics
+    share_data(_binary_db_controller.__name__, db_dsn=db_dsn, local_db_file=local_db_file)
+    db_source = get_db_source(db_dsn, local_db_file)
 
-    func = partial(get_oss_info_from_db, platform_version)
-    return_oss_list = do_multi_process(func, final_bin_info)
-    final_bin_info = return_oss_list[:]
+    bin_keys = []
+    for item in final_bin_info:
+        key = ""
+        if item.checksum and item.checksum != CONST_TLSH_NULL:
+            key = get_cache_key(os.path.basename(item.bin_name), item.checksum, item.source_code_path, platform_version,
+                                db_source)
+        bin_keys.append((item, key))
+    cached = {}
+    if match_result_cache:
+        cached = match_result_cache.get_many({key for _, key in bin_keys if key})
+
+    not_cached = []
+    for item, key in bin_keys:
+        if key in cached:
+            set_cached_db_match(item, *cached[key])
+        else:
+            not_cached.append((item, key))
+    bin_to_look_up = [item for item, _ in not_cached]
+
+    use_async_db = db_connections > 0 and not local_db_file
+    if use_async_db and not is_async_db_available():
+        logger.warning("(-k option) psycopg 3 is not installed. Look up the binary DB by the worker processes.")
+        use_async_db = False
+    if use_async_db:
+        start_time = time.time()
+        changed_list, statistics = get_oss_info_from_db_async(platform_version, bin_to_look_up, db_connections, db_dsn)
+        apply_changes(bin_to_look_up, changed_list)
+        record_stage_time("Binary DB", len(bin_to_look_up), time.time() - start_time)
+        statistics_list = [statistics]
+    else:
+        do_multi_process(partial(get_oss_info_from_db, platform_version), bin_to_look_up, "Binary DB")
+        # Each worker keeps its connections until all chunks are looked up.
+        statistics_list = collect_from_workers(close_connection_pool)
+    if statistics_list:
+        db_statistics = format_db_statistics(statistics_list)
+        if any(statistics["connection_failures"] for statistics in statistics_list):
+            logger.warning(f"Failed to connect to the binary DB: {db_statistics}")
+
+    if match_result_cache:
+        for item, key in not_cached:
+            if key and item.db_match is not None:  # Not stored if the binary DB couldn't be read.
+                match_result_cache.set(key, item.db_match, item.tlsh if item.tlsh_calculated else "")
+        match_result_cache.save()
+        match_result_statistics = match_result_cache.get_statistics()
+
+
+def set_cached_db_match(item, db_match, tlsh_value):
+    set_db_match(item, db_match)
+    item.db_match = db_match
+    if tlsh_value and not item.tlsh_calculated:  # Same file as the binary that was looked up
+        item.tlsh = tlsh_value
+        item.tlsh_calculated = True
+
+
+def get_checksum_tlsh_from_inventory(item):
+    if not file_inventory:
+        return False
+    try:
+        stat_result = os.stat(item.bin_name_with_installed_path)
+        checksum_value = file_inventory.get(item.bin_name_with_installed_path, stat_result, "sha1")
+        if checksum_value is None:
+            return False
+        item.set_checksum(checksum_value)
+        tlsh_value = file_inventory.get(item.bin_name_with_installed_path, stat_result, "tlsh")
+        if tlsh_value is not None:
+            item.set_tlsh(tlsh_value)
+            item.tlsh_calculated = True
+        return True
+    except Exception as error:
+        logger.debug(f"get_checksum_tlsh_from_inventory:{error}")
+    return False
+
+
+def set_checksum_tlsh_to_inventory(item):
+    if not file_inventory or not item.checksum:
+        return
+    try:
+        stat_result = os.stat(item.bin_name_with_installed_path)
+        file_inventory.set(item.bin_name_with_installed_path, stat_result, "sha1", item.checksum)
+        if item.tlsh_calculated:
+            file_inventory.set(item.bin_name_with_installed_path, stat_result, "tlsh", item.tlsh)
+    except Exception as error:
+        logger.debug(f"set_checksum_tlsh_to_inventory:{error}")
 
 
-def get_checksum_tlsh(bin_info_list, return_bin_list):
-    for item in bin_info_list:
+def get_checksum_tlsh(with_tlsh, bin_info_list):
+    changed_list = []
+    for idx, item in bin_info_list:
         tlsh_value = CONST_TLSH_NULL
         checksum_value = ""
 
-        try:
-            bin_file_full_path = item.bin_name_with_installed_path
-            if not os.path.exists(bin_file_full_path):
-                pass
-
-            f = open(bin_file_full_path, "rb")
-            byte = f.read()
-            sha1_hash = hashlib.sha1(byte)
-            checksum_value = sha1_hash.hexdigest()
-            tlsh_value = tlsh.hash(byte)
-            f.close()
-        except Exception:
-            pass
+        bin_file_full_path = item.bin_name_with_installed_path
+        if os.path.isfile(bin_file_full_path):
+            try:
+                checksum_value, tlsh_value = get_file_sha1_and_tlsh(bin_file_full_path, with_tlsh=with_tlsh)
+            except Exception as error:
+                logger.debug(f"get_checksum_tlsh:{error}")
         if tlsh_value == "":
             tlsh_value = CONST_TLSH_NULL
 
-        item.set_tlsh(tlsh_value)
-        item.set_checksum(checksum_value)
+        changes = {"checksum": checksum_value}
+        if with_tlsh:
+            changes.update({"tlsh": tlsh_value, "tlsh_calculated": True})
+        changed_list.append((idx, changes))
 
-    return_bin_list.extend(bin_info_list)
+    return changed_list
 
 
-def remove_duplicated_binaries_by_checking_checksum(remove_list_file):
+def remove_duplicated_binaries_by_checking_checksum(remove_list_file, remove_list, remove_tlsh_list):
     global final_bin_info
-    result_file_name = f"REMOVED_BIN_BY_DUPLICATION_{file_time}.txt"
-    str_bin_removed = ""
+    result_file = os.path.join(python_script_dir, f"REMOVED_BIN_BY_DUPLICATION_{file_time}.txt")
     filtered_binaries = []
-    checked_file_name = {}
+    checked_file_name = set()
     cnt = 0
-    remove_list, remove_tlsh_list = remove_from_the_list(remove_list_file)
 
-    for item in final_bin_info[:]:
-        bin_name_to_search = os.path.basename(item.bin_name)
-        bin_checksum = item.checksum
-        search_key = bin_checksum + bin_name_to_search
-
-        skip = search_key in remove_list
-        if not skip:
-            tlsh_items = remove_tlsh_list.get(bin_name_to_search)
-            if tlsh_items:
-                bin_tlsh = item.tlsh
-                for value in tlsh_items:
-                    tlsh_diff = tlsh.diff(bin_tlsh, value)
-                    if tlsh_diff <= 120:
-                        skip = True
-                        continue
-        if skip:
-            cnt += 1
-            print_removed_str = item.get_print_array(False)
-            for row_removed in print_removed_str:
-                str_bin_removed += f"{row_removed}\n"
-            continue
-        elif search_key not in checked_file_name:
-            find_result, same_name_binaries = search_binaries_by_bin_name_and_checksum(item.bin_name,
-                                                                                       bin_checksum)
-            checked_file_name[search_key] = find_result
-
-            if find_result:
-                final_added = ""  # finally added binary
-                # 0 : file in system folder, 1: Source Path exists, 2:exist in NOTICE.html, 3: shortest path
-                priority = ["", "", "", ""]
-                idx_notice = 2
-                value_notice = ""
-                for bin_same_name in same_name_binaries:
-                    bin_with_path = bin_same_name.bin_name
-                    notice_check = bin_same_name.notice
-                    src_path = bin_same_name.source_code_path
-
-                    if bin_with_path.startswith('system/'):
-                        priority[0] = return_shorter_installed_path_data(priority[0], bin_same_name)
-                    if src_path is not None and len(src_path) > 0:
-                        priority[1] = return_shorter_installed_path_data(priority[1], bin_same_name)
-                    if notice_check == "ok(NA)" or notice_check == "ok":
-                        value_notice = notice_check
-                        priority[idx_notice] = return_shorter_installed_path_data(priority[idx_notice],
-                                                                                  bin_same_name)
-
-                    priority[3] = return_shorter_installed_path_data(priority[3], bin_same_name)
-
-                for i in range(len(priority)):
-                    if priority[i] != "":
-                        if final_added == "":
-                            final_added = priority[i]
-                            if i != idx_notice and final_added.notice.find(
-                                    "nok") > -1 and value_notice != "":
-                                # If same binary is included in NOTICE.html, change the NOTICE value to "ok"
-                                final_added.set_notice(value_notice)
-                            filtered_binaries.append(final_added)
-                            break
-
-                for bin_same_name in same_name_binaries:
-                    if bin_same_name.bin_name != final_added.bin_name:
-                        print_removed_str = bin_same_name.get_print_array(False)
-                        for row_removed in print_removed_str:
-                            str_bin_removed += f"{row_removed}\n"
-            else:  # Don't have any duplicated binaries
-                filtered_binaries.append(item)
+    # Binaries with the same file name and checksum, in the order of final_bin_info
+    same_binaries = {}
+    for item in final_bin_info:
+        same_binaries.setdefault((os.path.basename(item.bin_name), item.checksum), []).append(item)
+
+    removed_file = None  # Removed binaries are written as they are found.
+
+    def write_removed_binary(item):
+        nonlocal removed_file
+        try:
+            if removed_file is None:
+                removed_file = open(result_file, "w")
+            for row_removed in item.get_print_array(False):
+                removed_file.write(f"{row_removed}\n")
+        except Exception as error:
+            logger.info(f"Failed to write text:{result_file}\n{error}")
+
+    try:
+        for item in final_bin_info:
+            bin_name_to_search = os.path.basename(item.bin_name)
+            bin_checksum = item.checksum
+            search_key = (bin_name_to_search, bin_checksum)
+
+            skip = bin_checksum + bin_name_to_search in remove_list
+            if not skip:
+                tlsh_index = remove_tlsh_list.get(bin_name_to_search)
+                if tlsh_index and tlsh_index.find(item.tlsh):
+                    skip = True
+            if skip:
+                cnt += 1
+                write_removed_binary(item)
+            elif search_key not in checked_file_name:
+                checked_file_name.add(search_key)
+                same_name_binaries = same_binaries[search_key]
+                if len(same_name_binaries) > 1:
+                    final_added = select_binary_among_duplicates(same_name_binaries)
+                    filtered_binaries.append(final_added)
+                    for bin_same_name in same_name_binaries:
+                        if bin_same_name.bin_name != final_added.bin_name:
+                            write_removed_binary(bin_same_name)
+                else:  # Don't have any duplicated binaries
+                    filtered_binaries.append(item)
+    finally:
+        if removed_file is not None:
+            removed_file.close()
     if remove_list_file != "":
         logger.warning(f"Number of files removed due to -r option result.txt: {cnt}")
     # Replace final binary list
-    final_bin_info = filtered_binaries[:]
-
-    # Write removed binary list to text file
-    if str_bin_removed != "":
-        write_txt_file(result_file_name, str_bin_removed, python_script_dir)
+    final_bin_info = filtered_binaries
+
+
+def select_binary_among_duplicates(same_name_binaries):
+    final_added = ""  # finally added binary
+    # 0 : file in system folder, 1: Source Path exists, 2:exist in NOTICE.html, 3: shortest path
+    priority = ["", "", "", ""]
+    idx_notice = 2
+    value_notice = ""
+    for bin_same_name in same_name_binaries:
+        bin_with_path = bin_same_name.bin_name
+        notice_check = bin_same_name.notice
+        src_path = bin_same_name.source_code_path
+
+        if bin_with_path.startswith('system/'):
+            priority[0] = return_shorter_installed_path_data(priority[0], bin_same_name)
+        if src_path is not None and len(src_path) > 0:
+            priority[1] = return_shorter_installed_path_data(priority[1], bin_same_name)
+        if notice_check == "ok(NA)" or notice_check == "ok":
+            value_notice = notice_check
+            priority[idx_notice] = return_shorter_installed_path_data(priority[idx_notice], bin_same_name)
+
+        priority[3] = return_shorter_installed_path_data(priority[3], bin_same_name)
+
+    for i in range(len(priority)):
+        if priority[i] != "":
+            final_added = priority[i]
+            if i != idx_notice and final_added.notice.find("nok") > -1 and value_notice != "":
+                # If same binary is included in NOTICE.html, change the NOTICE value to "ok"
+                final_added.set_notice(value_notice)
+            break
+    return final_added
 
 
 def return_shorter_installed_path_data(origin, new):
@@ -797,8 +826,8 @@ def return_shorter_installed_path_data(origin, new):
     return origin
 
 
-def set_oss_name_by_repository():
-    success = get_repositories_name()
+def set_oss_name_by_repository(fetch_web=False):
+    success = get_repositories_name(fetch_web)
     if success:
         for item in final_bin_info:
             try:
@@ -841,19 +870,34 @@ def find_meta_lic_files():
                         meta_lic_files[key] = lic
 
 
+def get_uncompressed_notice_name(notice_file):
+    file_name = os.path.basename(notice_file)
+    if file_name.endswith(GZ_EXTENSION):
+        file_name = file_name[:-len(GZ_EXTENSION)]
+    return file_name
+
+
 def create_and_copy_notice_zip(notice_files_list, zip_file_path):
+    # NOTICE.xml.gz is read without being extracted, so it's decompressed here
+    # to upload the readable NOTICE file to FOSSLight Hub.
     final_destination_file_name = ""
 
     if len(notice_files_list) == 1:
         single_file_path = notice_files_list[0]
-        destination_path = os.path.join(os.path.dirname(zip_file_path), os.path.basename(single_file_path))
-        shutil.copy(single_file_path, destination_path)
+        destination_path = os.path.join(os.path.dirname(zip_file_path), get_uncompressed_notice_name(single_file_path))
+        with open_notice_file(single_file_path) as f_in, open(destination_path, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
         final_destination_file_name = destination_path
         logger.debug(f"Notice file is copied to '{destination_path}'.")
     else:
         with zipfile.ZipFile(zip_file_path, 'w') as zipf:
             for single_file_path in notice_files_list:
-                zipf.write(single_file_path, arcname=os.path.basename(single_file_path))
+                file_name = get_uncompressed_notice_name(single_file_path)
+                if file_name in zipf.namelist():
+                    continue
+                with open_notice_file(single_file_path) as f_in:
+                    with zipf.open(file_name, 'w') as f_out:
+                        shutil.copyfileobj(f_in, f_out)
         final_destination_file_name = zip_file_path
 
     return final_destination_file_name
@@ -861,6 +905,7 @@ def create_and_copy_notice_zip(notice_files_list, zip_file_path):
 
 def main():
     global android_log_lines, ANDROID_LOG_FILE_NAME, python_script_dir, num_cores, file_time, logger, final_bin_info
+    global file_inventory, match_result_cache
     find_empty_path = False
     auto_fill_oss_name = True
     analyze_source = False
@@ -879,6 +924,13 @@ def main():
     result_excel_file_name = os.path.join(python_script_dir, f"fosslight_report_android_{file_time}")
     result_notice_zip_file_name = os.path.join(python_script_dir, f"notice_to_fosslight_hub_{file_time}.zip")
     remove_list_file = ""
+    cold_run = False
+    use_installed_files = False
+    all_tlsh = False
+    db_dsn = ""
+    local_db_file = ""
+    db_connections = 0
+    fetch_web_repositories = False
 
     parser = argparse.ArgumentParser(description='FOSSLight Android', prog='fosslight_android', add_help=False)
     parser.add_argument('-h', '--help', action='store_true', required=False)
@@ -891,6 +943,14 @@ def main():
     parser.add_argument('-p', '--packaging', type=str, required=False)
     parser.add_argument('-r', '--remove', type=str, required=False)
     parser.add_argument('-e', '--exclude', nargs="*", required=False, default=[])
+    parser.add_argument('-c', '--cold', action='store_true', required=False)
+    parser.add_argument('-l', '--installed_list', action='store_true', required=False)
+    parser.add_argument('-t', '--tlsh', action='store_true', required=False)
+    parser.add_argument('-d', '--db', type=str, required=False)
+    parser.add_argument('-x', '--export_db', type=str, required=False)
+    parser.add_argument('-b', '--local_db', type=str, required=False)
+    parser.add_argument('-k', '--db_connections', type=int, required=False)
+    parser.add_argument('-g', '--googlesource', action='store_true', required=False)
 
     args = parser.parse_args()
     if args.help:
@@ -898,8 +958,8 @@ def main():
     if args.version:
         print_version(PKG_NAME)
     if args.source:
-        os.chdir(args.source)
-        android_src_path = args.source
+        android_src_path = os.path.abspath(args.source)  # Before chdir, as a relative path is relative to the cwd
+        os.chdir(android_src_path)
     if args.more:  # Analyze source mode.
         analyze_source = True
     if args.android:
@@ -910,7 +970,16 @@ def main():
         auto_fill_oss_name = False
     if args.exclude:  # Path to exclude from source code analysis.
         path_to_exclude = args.exclude
-
+    if args.cold:  # Ignore the cached results of the previous scans.
+        cold_run = True
+    if args.installed_list:  # Find binaries from the installed-files lists of the build.
+        use_installed_files = True
+    if args.tlsh:  # Calculate TLSH of all binaries, not only of the ones that need it.
+        all_tlsh = True
+    db_dsn = get_db_dsn(args.db)  # Connection string of the binary DB. The default DB is used if it's empty.
+
+    # Dependencies used only by the scan are imported here, so that -h, -v and -p start quickly.
+    from fosslight_util.set_log import init_log
     logger, result_log = init_log(log_txt_file, True, logging.INFO, logging.DEBUG, PKG_NAME)
 
     logger.info(f"Tool Info : {result_log['Tool Info']}")
@@ -918,6 +987,20 @@ def main():
     if args.packaging:
         check_packaging_files(args.packaging)
         return
+    if args.export_db:  # Export the binary DB to a local file. It is refreshed incrementally, unless -c is given.
+        _binary_db_controller.db_dsn = db_dsn
+        if not export_to_local_db(os.path.abspath(args.export_db), cold_run):
+            sys.exit(1)
+        return
+    if args.local_db:  # Use the exported binary DB instead of connecting to it.
+        local_db_file = os.path.abspath(args.local_db)
+        if not os.path.isfile(local_db_file):
+            logger.error(f"(-b option) Fail to find a file:{local_db_file}")
+            sys.exit(1)
+    if args.db_connections:  # Look up the binary DB asynchronously, regardless of the number of cores.
+        db_connections = args.db_connections
+    if args.googlesource:  # Fetch the repository list of android.googlesource.com if there is no manifest of aosp.
+        fetch_web_repositories = True
 
     if args.remove:  # Remove the inputted list from the binary list.
         remove_list_file = args.remove
@@ -925,25 +1008,39 @@ def main():
     if not read_success:
         logger.error("(-a option) Fail to read a file:" + ANDROID_LOG_FILE_NAME)
         sys.exit(1)
-    else:
-        set_env_variables_from_result_log(android_src_path)
 
-    map_binary_module_name_and_path(find_binaries_from_out_dir())
+    # The cache is initialized first, as the index of module-info.json and the repo manifest are loaded from it
+    # while the build log is analyzed.
+    if init_cache(python_script_dir, cold_run):
+        file_inventory = FileInventory(get_cache_file(INVENTORY_FILE_NAME), cold_run)
+        match_result_cache = MatchResultCache(get_cache_file(MATCH_RESULT_FILE_NAME), cold_run)
+
+    # Workers are started before module-info.json and NOTICE files are loaded, so that they don't get a copy of them.
+    # They are used by all stages.
+    start_pool(num_cores)
+    try:
+        set_env_variables_from_result_log(android_src_path)
+        map_binary_module_name_and_path(find_binaries_from_out_dir(use_installed_files))
 
-    notice_result_comment = find_notice_value(result_notice_zip_file_name)
-    find_bin_license_info()
+        notice_result_comment = find_notice_value(result_notice_zip_file_name)
+        find_bin_license_info()
 
-    set_mk_file_path()  # Mk file path and local path, location of NOTICE file, can be different
-    filter_non_path_bin(find_empty_path)
+        set_mk_file_path()  # Mk file path and local path, location of NOTICE file, can be different
+        filter_non_path_bin(find_empty_path)
 
-    set_checksum_tlsh_and_get_oss_from_db_after_remove_duplication(remove_list_file)
+        set_checksum_tlsh_and_get_oss_from_db_after_remove_duplication(remove_list_file, all_tlsh, db_dsn,
+                                                                       local_db_file, db_connections)
+    finally:
+        close_pool()
 
     if auto_fill_oss_name:
-        set_oss_name_by_repository()
+        set_oss_name_by_repository(fetch_web_repositories)
     if analyze_source:
         from ._src_analysis import find_item_to_analyze
         final_bin_info = find_item_to_analyze(final_bin_info, python_script_dir, file_time, path_to_exclude)
 
+    from fosslight_util.oss_item import ScannerItem
+    from fosslight_util.output_format import write_output_file
     scan_item = ScannerItem(PKG_NAME, start_time)
     scan_item.set_cover_pathinfo(android_src_path, "")
 
@@ -961,6 +1058,14 @@ def main():
     result_log["Output FOSSLight Report"] = f"{result_file}"
 
     # Print the result
+    if file_inventory:
+        result_log["Inventory cache"] = file_inventory.get_statistics()
+    if db_statistics:
+        result_log["Binary DB"] = db_statistics
+    if match_result_statistics:
+        result_log["Binary DB result cache"] = match_result_statistics
+    result_log["Running time of stages"] = get_stage_running_time()
+    result_log["Worker utilization"] = get_worker_utilization()
     result_log["Running time"] = scan_item.cover.running_time
     result_log["Output Directory"] = python_script_dir
     try:
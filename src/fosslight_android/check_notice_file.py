@@ -5,16 +5,58 @@
 
 import logging
 import os
-from bs4 import BeautifulSoup
 from ._util import read_file, write_txt_file
 from ._common import NOTICE_FILE_NAME
+from ._cache import get_file_sha1, load_cache_object, save_cache_object
+from ._parallel import map_in_parallel
 from fosslight_util.constant import LOGGER_NAME
 import re
 import gzip
-import shutil
 
 logger = logging.getLogger(LOGGER_NAME)
 CANNOT_FIND_MSG = "CANNOT_FIND_NOTICE"
+_APEX_NAME_PATTERN = re.compile(r"apex\/([^\/]+)\/")
+_APEX_EXTENSIONS = (".apex", ".capex")
+GZ_EXTENSION = ".gz"
+INVALID_XML_CHARS = bytes(c for c in range(0x20) if c not in b"\t\n\r")
+XML_EXTENSIONS = (".xml", ".xml.gz")
+HTML_EXTENSIONS = (".html", ".html.gz")
+NOTICE_CACHE_VERSION = 2
+
+
+class NoticeIndex:
+    # File names listed in NOTICE files, indexed by full path and by file name.
+    def __init__(self, file_names=None):
+        self.paths = set()
+        self.file_names = {}  # file name : [full paths]
+        self.apex_names = set()  # file names of APEX archives
+        if file_names:
+            self.update(file_names)
+
+    def __contains__(self, path):
+        return path in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path):
+        if path in self.paths:
+            return
+        self.paths.add(path)
+        file_name = os.path.basename(path)
+        self.file_names.setdefault(file_name, []).append(path)
+        if file_name.endswith(_APEX_EXTENSIONS):
+            self.apex_names.add(file_name)
+
+    def update(self, paths):
+        for path in paths:
+            self.add(path)
+
+    def has_file_name(self, file_name):
+        return file_name in self.file_names
 
 
 def run_notice_html_checklist(binary_file, check_type, notice_file):
@@ -48,58 +90,42 @@ def run_notice_html_checklist(binary_file, check_type, notice_file):
 
 def find_bin_in_notice(binary_file_name, notice_file_list):
     notice_found = False
+    if not isinstance(notice_file_list, NoticeIndex):
+        notice_file_list = NoticeIndex(notice_file_list)
     if binary_file_name:
         if binary_file_name in notice_file_list:
             notice_found = True
-        else:
-            apex_name_search_list = []
+        elif notice_file_list.has_file_name(os.path.basename(binary_file_name)):
+            notice_found = True
+        elif notice_file_list.apex_names:
             try:
-                apex_name = ""
-                m = re.search(r"apex\/([^\/]+)\/", binary_file_name)
+                m = _APEX_NAME_PATTERN.search(binary_file_name)
                 if m:
                     apex_name = m.group(1)
-                if apex_name:
                     apex_name_search_list = [f"{apex_name}.apex", f"{apex_name}.capex",
                                              f"{apex_name}_compressed.apex", f"{apex_name}-uncompressed.apex"]
+                    notice_found = any(name in notice_file_list.apex_names for name in apex_name_search_list)
             except Exception as error:
                 logger.debug(f"find_bin_in_notice :{error}")
-            binary_without_path = os.path.basename(binary_file_name)
-            for key in notice_file_list:
-                key_file_name = os.path.basename(key)
-                if key_file_name == binary_without_path or any(apex_name == key_file_name for apex_name in apex_name_search_list):
-                    notice_found = True
-                    break
 
     return notice_found
 
 
 def find_files_by_extension(path):
-    extensions = ['.html', '.xml']
-    GZ_EXTENSION = '.gz'
+    # NOTICE.html first, otherwise NOTICE*.xml. A .gz is read as it is unless the same file without .gz exists.
+    extensions = [HTML_EXTENSIONS, XML_EXTENSIONS]
     files = []
-    try:
-        gz_files = [os.path.join(path, f) for f in os.listdir(path) if f.endswith(GZ_EXTENSION)]
-        for gz_file in gz_files:
-            unzip_file = gz_file.replace('.gz', '')
-            if not os.path.isfile(unzip_file):
-                with gzip.open(gz_file, 'rb') as f_in:
-                    with open(unzip_file, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-    except Exception as error:
-        logger.info(f"Fail unzip gz file:{error}")
 
     for extension in extensions:
         files = [os.path.join(path, f) for f in os.listdir(path) if f.endswith(extension)]
         if len(files) > 0:
             break
 
-    return files
+    return [f for f in files if not (f.endswith(GZ_EXTENSION) and f[:-len(GZ_EXTENSION)] in files)]
 
 
-def read_notice_file(notice_file_path):
-    final_notice_file = {}
-    # NOTICE.html need to be skipped the errors related to decode
-    encodings = ["latin-1", "utf-8", "utf-16"]
+def read_notice_file(notice_file_path, num_cores=1):
+    final_notice_file = NoticeIndex()
     notice_files = []
 
     if os.path.isfile(notice_file_path):
@@ -113,36 +139,179 @@ def read_notice_file(notice_file_path):
             notice_files.extend(additional_notice_files)
             notice_files = list(set(notice_files))
 
+    files_to_parse = []
+    same_content_files = {}  # cache name : notice files with the same content
+    parsed_file_names = {}
     for file_name in notice_files:
-        file_list = {}
-        file_content = ""
         if os.path.isfile(file_name):
-            for encoding_option in encodings:
+            if os.path.getsize(file_name) > 0:
                 try:
-                    file = open(file_name, encoding=encoding_option)
-                    file_content = file.read()
-                    file.close()
-                    if file_content != "":
-                        break
-                except Exception:
-                    pass
-            if file_content != "":
-                try:
-                    if file_name.endswith("xml"):
-                        file_list = parsing_notice_xml_format(file_content)
-                    else:
-                        file_list = parsing_notice_html_format(file_content)
+                    cache_name = f"notice_{NOTICE_CACHE_VERSION}_{get_file_sha1(file_name)}.pickle"
                 except Exception as error:
-                    logger.info("Can't read a notice. :" + file_name)
-                    logger.info(f"{error}")
-                final_notice_file.update(file_list)
+                    logger.debug(f"Failed to get sha1 of {file_name}:{error}")
+                    cache_name = ""
+                cached = load_cache_object(cache_name) if cache_name else None
+                if cached is not None:
+                    parsed_file_names[file_name] = cached
+                elif cache_name in same_content_files:
+                    same_content_files[cache_name].append(file_name)
+                else:
+                    if cache_name:
+                        same_content_files[cache_name] = [file_name]
+                    files_to_parse.append((file_name, cache_name))
             else:
                 logger.info(f"Notice file is empty. :{file_name}")
 
+    # NOTICE files of each partition are parsed at the same time, and the parsed result is cached by its content.
+    if files_to_parse:
+        workers = max(1, min(num_cores, len(files_to_parse)))
+        if workers > 1:
+            results = map_in_parallel(read_file_names_in_notice, [f for f, _ in files_to_parse], workers)
+        else:
+            results = [read_file_names_in_notice(f) for f, _ in files_to_parse]
+        for (file_name, cache_name), file_list in zip(files_to_parse, results):
+            for same_file in same_content_files.get(cache_name, [file_name]):
+                parsed_file_names[same_file] = file_list
+            if cache_name and file_list:
+                save_cache_object(cache_name, file_list)
+
+    for file_name in notice_files:
+        final_notice_file.update(parsed_file_names.get(file_name, []))
+
     return final_notice_file, notice_files
 
 
+def open_notice_file(file_name):
+    if file_name.endswith(GZ_EXTENSION):
+        return gzip.open(file_name, "rb")
+    return open(file_name, "rb")
+
+
+def read_file_names_in_notice(file_name):
+    # Return a list of file names in the NOTICE file.
+    file_list = {}
+    is_xml = file_name.endswith(XML_EXTENSIONS)
+    try:
+        with open_notice_file(file_name) as f:
+            if is_xml:
+                file_list = parsing_notice_xml_stream(f)
+            else:
+                file_list = parsing_notice_html_stream(f)
+    except Exception as error:
+        logger.debug(f"Failed to parse {file_name} incrementally, read it at once:{error}")
+        try:
+            with open_notice_file(file_name) as f:
+                file_content = f.read().decode("latin-1")
+            if is_xml:
+                file_list = parsing_notice_xml_format(file_content)
+            else:
+                file_list = parsing_notice_html_format(file_content)
+        except Exception as error:
+            logger.info("Can't read a notice. :" + file_name)
+            logger.info(f"{error}")
+    return list(file_list.keys())
+
+
+def release_parsed_element(elem):
+    # Free the element and its already parsed siblings, so the tree doesn't grow while parsing.
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+class InvalidXmlCharFilter:
+    # Remove control characters that XML 1.0 doesn't allow while the file is read.
+    # lxml stops reading the rest of the text node after one of them, which drops entities like &amp;.
+    def __init__(self, f):
+        self._f = f
+
+    def read(self, size=-1):
+        return self._f.read(size).translate(None, INVALID_XML_CHARS)
+
+
+def parsing_notice_xml_stream(f):
+    from lxml import etree
+    file_list = {}
+    context = etree.iterparse(InvalidXmlCharFilter(f), events=("end",), recover=True, huge_tree=True)
+    for _, elem in context:
+        if elem.tag == "file-name":  # NOTICE.xml
+            line = (elem.text or "").strip()
+            if line.startswith('/'):
+                line = line[1:]
+            file_list[line] = ""
+        release_parsed_element(elem)
+    if context.error_log:
+        # The recovered text may miss parts of file names, e.g. an unescaped '&'.
+        raise ValueError(f"Invalid XML: {context.error_log.last_error}")
+    return file_list
+
+
+def iter_text_nodes(elem):
+    if elem.text:
+        yield elem.text
+    for child in elem:
+        if isinstance(child.tag, str):
+            yield from iter_text_nodes(child)
+        if child.tail:
+            yield child.tail
+
+
+def has_class(elem, class_name):
+    return class_name in (elem.get("class") or "").split()
+
+
+def parsing_notice_html_stream(f):
+    from lxml import etree
+    # Same file names as parsing_notice_html_format(), read from div.file-list, strong, ul.file-list li
+    # and span lang=EN-US while the rest of the document is released as it is parsed.
+    file_list = {}
+    file_list_ul_depth = 0
+    capture_depth = 0
+    for event, elem in etree.iterparse(f, events=("start", "end"), html=True, recover=True, huge_tree=True):
+        tag = elem.tag
+        if not isinstance(tag, str):
+            continue
+        is_file_list_ul = tag == "ul" and has_class(elem, "file-list")
+        capture = (tag == "div" and has_class(elem, "file-list")) or tag == "strong" or \
+            (tag == "li" and file_list_ul_depth > 0) or (tag == "span" and elem.get("lang") == "EN-US")
+        if event == "start":
+            if is_file_list_ul:
+                file_list_ul_depth += 1
+            if capture:
+                capture_depth += 1
+            continue
+
+        if is_file_list_ul:
+            file_list_ul_depth -= 1
+        if capture:
+            capture_depth -= 1
+            if tag == "span":  # Exceptional case for MC <span lang=EN-US>
+                for line in iter_text_nodes(elem):
+                    line = line.strip()
+                    if line.startswith('/'):
+                        line = line[1:]
+                    if line != "" and line.find(" ") < 0:
+                        file_list[line] = ""
+            else:
+                if tag == "div":
+                    str_div = "\n".join(iter_text_nodes(elem))
+                else:
+                    str_div = "".join(iter_text_nodes(elem))
+                for line in str_div.split():
+                    if line.find('<') < 0 and line.find('>') < 0:
+                        line = line.replace('//', '/')
+                        if line.startswith('/'):
+                            line = line[1:]
+                        file_list[line] = ""
+        if capture_depth == 0:
+            release_parsed_element(elem)
+    return file_list
+
+
 def parsing_notice_xml_format(notice_file_content):
+    from bs4 import BeautifulSoup
     file_list = {}
     soup = BeautifulSoup(notice_file_content, "lxml")
 
@@ -156,6 +325,7 @@ def parsing_notice_xml_format(notice_file_content):
 
 
 def parsing_notice_html_format(notice_file_content):
+    from bs4 import BeautifulSoup
     file_list = {}
     soup = BeautifulSoup(notice_file_content, "lxml")
 
@@ -309,6 +479,7 @@ def create_license_txt_files(file_list, result_file_path):
 
 
 def parsing_notice_html_for_license_text(notice_file_content):
+    from bs4 import BeautifulSoup
     file_list = []
     soup = BeautifulSoup(notice_file_content, 'lxml')
     tds = soup.findAll('tr')
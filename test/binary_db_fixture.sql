@@ -0,0 +1,29 @@
+-- Rows of the binary DB used by test_binary_db.py, loaded into a local PostgreSQL.
+-- SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+-- SPDX-License-Identifier: Apache-2.0
+DROP TABLE IF EXISTS lgematching;
+CREATE TABLE lgematching (
+    filename text NOT NULL,
+    pathname text,
+    checksum text,
+    tlshchecksum text,
+    ossname text,
+    ossversion text,
+    license text,
+    platformname text,
+    platformversion text,
+    sourcepath text,
+    updatedate timestamp
+);
+CREATE INDEX lgematching_filename_checksum ON lgematching (filename, checksum);
+CREATE INDEX lgematching_filename_tlshchecksum ON lgematching (filename, tlshchecksum);
+
+INSERT INTO lgematching VALUES
+    ('libfoo.so', 'system/lib/libfoo.so', '81d02aaa0ee04867fa03a964f24d0c74552825d7',
+     'T14E815D5CAC37840163C4D58B7DC2624EFC44792596EFEF1AE9431D53FA8A8720E65D84',
+     'foo', '1.0', 'Apache-2.0', 'Android', '12', 'external/foo', '2023-01-01'),
+    ('libbar.so', 'system/lib/libbar.so', '5989366687276cda720ba1e85eee55923336a73d',
+     'T12B816D1CAC37840163C4D58BFDC2624AFC4439A146EFEF1AA9431D53BACA4720E67C84',
+     'bar', '2.0', 'MIT', 'Android', '11', 'external/bar', '2022-01-01'),
+    ('libbar.so', 'vendor/lib/libbar.so', 'da39a3ee5e6b4b0d3255bfef95601890afd80709',
+     '0', 'bar-vendor', '2.0', 'MIT', 'Android', '12', 'vendor/bar', '2023-01-01');
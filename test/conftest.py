@@ -19,6 +19,25 @@ def android_build_log():
     return os.getenv("ANDROID_BUILD_LOG")
 
 
+@pytest.fixture
+def binary_db_dsn():
+    # Connection string of a local PostgreSQL, e.g. "host=localhost dbname=bat_test user=postgres".
+    # The tables in it are replaced with the rows of binary_db_fixture.sql.
+    dsn = os.getenv("FOSSLIGHT_ANDROID_TEST_DB_DSN")
+    if not dsn:
+        pytest.skip("FOSSLIGHT_ANDROID_TEST_DB_DSN is not set")
+    import psycopg2
+    with open(os.path.join(os.path.dirname(__file__), "binary_db_fixture.sql"), "r", encoding="utf-8") as f:
+        fixture_sql = f.read()
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(fixture_sql)
+    finally:
+        conn.close()
+    return dsn
+
+
 @pytest.fixture
 def run_command():
     def _run_command(command):
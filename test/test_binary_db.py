@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import random
+import time
+import pytest
+from fosslight_android import _binary_db_controller
+from fosslight_android._binary_db_controller import (
+    PLATFORM_NAME,
+    close_connection_pool,
+    find_matched_tlsh,
+    get_oss_info_from_db
+)
+from fosslight_android._local_binary_db import export_binary_db
+from fosslight_android._tlsh_distance import VECTORIZE_MIN_CANDIDATES
+from fosslight_android._common import AndroidBinary
+
+
+def create_binary(tmp_path, bin_name, data, source_path):
+    file_path = tmp_path / bin_name
+    file_path.write_bytes(data)
+    item = AndroidBinary(f"system/lib/{bin_name}")
+    item.bin_name_with_installed_path = str(file_path)
+    item.checksum = hashlib.sha1(data).hexdigest()
+    item.source_code_path = source_path
+    return item
+
+
+@pytest.mark.release
+def test_get_oss_info_from_db(tmp_path, binary_db_dsn):
+
+    # given
+    data = b"".join(hashlib.sha256(str(idx).encode()).digest() for idx in range(128))
+    bin_info_list = [create_binary(tmp_path, "libfoo.so", data, "external/foo"),  # Same checksum
+                     create_binary(tmp_path, "libbar.so", data, "external/bar"),  # Similar TLSH
+                     create_binary(tmp_path, "libnew.so", data, "external/new")]
+    _binary_db_controller.db_dsn = binary_db_dsn
+
+    # when
+    changed_list = dict(get_oss_info_from_db("12", list(enumerate(bin_info_list))))
+    statistics = close_connection_pool()
+
+    # then
+    assert changed_list[0]["oss_name"] == "foo"
+    assert "tlsh" not in changed_list[0]
+    assert changed_list[1]["oss_name"] == "bar"
+    assert changed_list[1]["tlsh_calculated"]
+    assert changed_list[2]["is_new_bin"]
+    assert "New Binary" in changed_list[2]["comment"]
+    assert statistics["connections"] == 1
+    assert statistics["connection_failures"] == 0
+    assert set(statistics["queries"]) == {"fl_select_by_checksum", "fl_select_tlsh_candidates", "fl_select_by_tlsh"}
+
+
+@pytest.mark.release
+def test_query_time_of_async_lookup_is_not_counted_per_batch(tmp_path, binary_db_dsn, monkeypatch):
+
+    # given
+    pytest.importorskip("psycopg")
+    from fosslight_android import _async_binary_db
+    bin_info_list = [create_binary(tmp_path, f"lib{idx}.so", str(idx).encode() * 64, "external/foo")
+                     for idx in range(_async_binary_db.ASYNC_BATCH_SIZE * 2)]
+    execute_all = _async_binary_db._execute_all
+    calls = []  # (elapsed, query time added)
+
+    async def timed_execute_all(conn, statements, use_pipeline, statistics):
+        query_time = sum(total for _, total, _ in statistics["queries"].values())
+        start_time = time.perf_counter()
+        rows_list = await execute_all(conn, statements, use_pipeline, statistics)
+        calls.append((time.perf_counter() - start_time,
+                      sum(total for _, total, _ in statistics["queries"].values()) - query_time))
+        return rows_list
+
+    monkeypatch.setattr(_async_binary_db, "_execute_all", timed_execute_all)
+
+    # when
+    changed_list, statistics = _async_binary_db.get_oss_info_from_db_async("12", bin_info_list, 1, binary_db_dsn)
+
+    # then
+    assert len(changed_list) == len(bin_info_list)
+    assert statistics["queries"]["fl_select_by_checksum"][0] == 2
+    assert calls
+    assert all(query_time <= elapsed for elapsed, query_time in calls)
+
+
+@pytest.mark.release
+def test_find_matched_tlsh_reuses_candidates_in_another_order():
+
+    # given
+    rand = random.Random(0)
+    candidates = [("libbar.so", "T1" + "".join(rand.choice("0123456789ABCDEF") for _ in range(70)), "external/bar",
+                   "android", "12", None) for _ in range(VECTORIZE_MIN_CANDIDATES)]
+    query = candidates[-1][1]
+    decoded_candidates = {}
+
+    # when
+    first = find_matched_tlsh(query, candidates, "external/bar", "12", decoded_candidates, "libbar.so")
+    second = find_matched_tlsh(query, candidates[::-1], "external/bar", "12", decoded_candidates, "libbar.so")
+
+    # then
+    assert first == query
+    assert second == query
+
+
+@pytest.mark.release
+def test_refresh_of_local_db_keeps_other_oss_of_binary(tmp_path, binary_db_dsn):
+
+    # given
+    import psycopg2
+    import sqlite3
+    local_db_file = str(tmp_path / "binary_db.sqlite")
+    conn = psycopg2.connect(binary_db_dsn)
+    with conn, conn.cursor() as cur:  # Second OSS of libfoo.so
+        cur.execute("INSERT INTO lgematching SELECT filename, pathname, checksum, tlshchecksum, 'foo-extra', '1.0', 'MIT', "
+                    "platformname, platformversion, sourcepath, '2022-06-01' FROM lgematching WHERE filename = 'libfoo.so'")
+    export_binary_db(local_db_file, conn, PLATFORM_NAME)
+    with conn, conn.cursor() as cur:
+        cur.execute("UPDATE lgematching SET license = 'BSD-3-Clause', updatedate = '2024-01-01' "
+                    "WHERE filename = 'libfoo.so' AND ossname = 'foo'")
+
+    # when
+    export_binary_db(local_db_file, conn, PLATFORM_NAME)
+    conn.close()
+
+    # then
+    local_conn = sqlite3.connect(local_db_file)
+    rows = sorted(local_conn.execute("SELECT ossname, license FROM lgematching WHERE filename = 'libfoo.so'").fetchall())
+    local_conn.close()
+    assert rows == [("foo", "BSD-3-Clause"), ("foo-extra", "MIT")]
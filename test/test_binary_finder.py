@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import random
+import tarfile
+import pytest
+from fosslight_android._binary_finder import (
+    TYPE_ARCHIVE,
+    TYPE_DATA,
+    TYPE_ELF,
+    TYPE_EMPTY,
+    TYPE_TEXT,
+    classify_bytes,
+    find_binary_candidates_from_installed_files,
+    get_file_type,
+    is_out_dir_data_candidate,
+    read_installed_files_manifests
+)
+from fosslight_android._cache import FileInventory
+
+
+def tar_bytes(content):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        info = tarfile.TarInfo("data.bin")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+@pytest.mark.release
+def test_classify_bytes():
+
+    # given
+    content = random.Random(0).randbytes(4096)
+    archives = [gzip.compress(content), lzma.compress(content), bz2.compress(content), tar_bytes(content),
+                b"\x28\xb5\x2f\xfd" + content, b"\x3a\xff\x26\xed" + content, b"ANDROID!" + content]
+
+    # when
+    archive_types = [classify_bytes(archive[:4096]) for archive in archives]
+
+    # then
+    assert archive_types == [TYPE_ARCHIVE] * len(archives)
+    assert classify_bytes(content) == TYPE_DATA
+    assert classify_bytes(b"\x7fELF\x02\x01\x01") == TYPE_ELF
+    assert classify_bytes(b"ro.build.version=12\n") == TYPE_TEXT
+    assert classify_bytes(b"") == TYPE_EMPTY
+    assert is_out_dir_data_candidate("out/target/product/x/vendor_blob", TYPE_DATA)
+    assert not is_out_dir_data_candidate("out/target/product/x/ramdisk.cpio.gz", TYPE_ARCHIVE)
+
+
+@pytest.mark.release
+def test_unreadable_file_type_is_not_cached(tmp_path):
+
+    # given
+    file_path = tmp_path / "libfoo.so"
+    file_path.write_bytes(b"\x7fELF\x02\x01\x01")
+    stat_result = os.lstat(file_path)
+    inventory = FileInventory("")
+    file_path.unlink()
+
+    # when
+    file_type = get_file_type(str(file_path), stat_result, inventory)
+
+    # then
+    assert file_type is None
+    assert inventory.get(str(file_path), stat_result, "file_type") is None
+
+
+@pytest.mark.release
+def test_read_installed_files_manifests(tmp_path):
+
+    # given
+    (tmp_path / "installed-files.json").write_text(json.dumps([{"Name": "/system/lib/liba.so", "Size": 8},
+                                                               {"Name": "/system/bin/b"}]))
+    (tmp_path / "installed-files.txt").write_text("100 /system/lib/ignored.so\n")  # Same partition as the .json
+    (tmp_path / "installed-files-vendor.txt").write_text("  16 /vendor/lib/libc.so\nbroken\n")
+
+    # when
+    installed_files = read_installed_files_manifests(str(tmp_path))
+
+    # then
+    assert installed_files == {"system/lib/liba.so": 8, "system/bin/b": -1, "vendor/lib/libc.so": 16}
+
+
+@pytest.mark.release
+def test_find_binary_candidates_from_installed_files(tmp_path):
+
+    # given
+    (tmp_path / "system" / "lib").mkdir(parents=True)
+    (tmp_path / "system" / "lib" / "liba.so").write_bytes(b"\x7fELF\x02\x01\x01")
+    (tmp_path / "system" / "lib" / "notes.txt").write_text("text")
+    (tmp_path / "system" / "lib" / "liblink.so").symlink_to("liba.so")
+    (tmp_path / "vendor" / "lib").mkdir(parents=True)
+    (tmp_path / "vendor" / "lib" / "libnotlisted.so").write_bytes(b"\x7fELF\x02\x01\x01")
+    (tmp_path / "installed-files.txt").write_text("7 /system/lib/liba.so\n4 /system/lib/notes.txt\n"
+                                                  "7 /system/lib/liblink.so\n7 /system/lib/missing.so\n")
+
+    # when
+    candidates = find_binary_candidates_from_installed_files(str(tmp_path))
+
+    # then
+    assert sorted(candidates) == [str(tmp_path / "system" / "lib" / "liba.so"),
+                                  str(tmp_path / "vendor" / "lib" / "libnotlisted.so")]
+    assert find_binary_candidates_from_installed_files(str(tmp_path / "vendor")) is None
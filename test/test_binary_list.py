@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+import pytest
+from fosslight_android import android_binary_analysis
+from fosslight_android._common import AndroidBinary
+from fosslight_android.android_binary_analysis import (
+    filter_non_path_bin,
+    remove_duplicated_binaries_by_checking_checksum,
+    select_binary_among_duplicates
+)
+
+FILE_TIME = "test"
+
+
+def create_binaries(seed):
+    rand = random.Random(seed)
+    bin_info_list = []
+    for idx in range(300):
+        item = AndroidBinary(f"{rand.choice(['system', 'vendor', 'odm'])}/{rand.choice(['lib', 'lib64/hw'])}/"
+                             f"lib{rand.randint(0, 40)}.so")
+        item.checksum = str(rand.randint(0, 2))
+        item.source_code_path = rand.choice(["", f"external/{idx}"])
+        item.notice = rand.choice(["ok", "nok", ""])
+        bin_info_list.append(item)
+    return bin_info_list
+
+
+def remove_duplicates_by_linear_search(bin_info_list, remove_list):
+    # The former search of the same binaries for each binary
+    filtered_binaries = []
+    checked_file_name = set()
+    for item in bin_info_list:
+        search_key = item.checksum + os.path.basename(item.bin_name)
+        if search_key in remove_list or search_key in checked_file_name:
+            continue
+        checked_file_name.add(search_key)
+        same_binaries = [other for other in bin_info_list
+                         if other.checksum + os.path.basename(other.bin_name) == search_key]
+        filtered_binaries.append(select_binary_among_duplicates(same_binaries) if len(same_binaries) > 1 else item)
+    return filtered_binaries
+
+
+def get_rows(bin_info_list):
+    return [(item.bin_name, item.checksum, item.notice) for item in bin_info_list]
+
+
+@pytest.mark.release
+def test_remove_duplicated_binaries_keeps_order_of_linear_search(tmp_path, monkeypatch):
+
+    # given
+    remove_list = {"0lib1.so": "", "2lib2.so": ""}
+    expected = get_rows(remove_duplicates_by_linear_search(create_binaries(0), remove_list))
+    monkeypatch.setattr(android_binary_analysis, "final_bin_info", create_binaries(0))
+    monkeypatch.setattr(android_binary_analysis, "python_script_dir", str(tmp_path))
+    monkeypatch.setattr(android_binary_analysis, "file_time", FILE_TIME)
+
+    # when
+    remove_duplicated_binaries_by_checking_checksum("result.txt", remove_list, {})
+
+    # then
+    assert get_rows(android_binary_analysis.final_bin_info) == expected
+    assert (tmp_path / f"REMOVED_BIN_BY_DUPLICATION_{FILE_TIME}.txt").is_file()
+
+
+@pytest.mark.release
+def test_filter_non_path_bin_keeps_order(tmp_path, monkeypatch):
+
+    # given
+    (tmp_path / "system" / "lib").mkdir(parents=True)
+    (tmp_path / "system" / "lib" / "liba.so").write_bytes(b"a")
+    (tmp_path / "system" / "lib" / "liblink.so").symlink_to("liba.so")
+    (tmp_path / "system" / "lib" / "libdangling.so").symlink_to("libnone.so")
+    bin_names = ["system/lib/liba.so", "system/framework/boot.oat", "system/lib/liblink.so",
+                 "system/lib/libdangling.so", "system/bin/run.sh", "system/lib/libnopath.so", "system/etc/a.xml"]
+    bin_info_list = [AndroidBinary(bin_name) for bin_name in bin_names]
+    bin_info_list[-1].source_code_path = "external/a"
+    monkeypatch.setattr(android_binary_analysis, "final_bin_info", bin_info_list)
+    monkeypatch.setattr(android_binary_analysis, "build_out_path", str(tmp_path))
+
+    # when
+    filter_non_path_bin(False)
+
+    # then
+    assert [item.bin_name for item in android_binary_analysis.final_bin_info] == \
+        ["system/lib/liba.so", "system/lib/libdangling.so", "system/lib/libnopath.so", "system/etc/a.xml"]
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import subprocess
+import sys
+import pytest
+
+MODULE_NAME = "fosslight_android.android_binary_analysis"
+IMPORT_TIME_BUDGET = 1.0  # seconds, about 10 times of the import time on a developer machine
+# Imported only by the stages that use them.
+LAZY_MODULES = ["pandas", "numpy", "psycopg2", "bs4", "lxml", "tqdm", "fosslight_binary", "fosslight_util.output_format"]
+
+
+def get_import_time(module_name):
+    # Return {module name: cumulative import time in seconds} reported by "python -X importtime".
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    import_time = {}
+    for line in result.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_time[name.strip()] = int(cumulative) / 1000000
+    return import_time
+
+
+@pytest.mark.release
+def test_import_time():
+
+    # when
+    import_time = get_import_time(MODULE_NAME)
+
+    # then
+    assert import_time[MODULE_NAME] < IMPORT_TIME_BUDGET
+    assert [name for name in LAZY_MODULES if name in import_time] == []
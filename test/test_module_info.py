@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from fosslight_android._module_info import read_module_info
+
+BUILD_OUT_PATH = "out/target/product/generic"
+MODULE_INFO = """{
+  "libfoo": {"path": ["external/foo"], "installed": ["out/target/product/generic/system/lib/libfoo.so"]},
+  "libbar": {"path": ["external/bar"], "installed": ["out/target/product/generic/system/lib/libbar.so",
+                                                     "out/target/product/generic/system/lib/libfoo.so"]},
+  "libfoo": {"path": ["vendor/foo"], "installed": ["out/target/product/generic/vendor/lib/libfoo.so"]}
+}"""
+
+
+@pytest.mark.release
+def test_module_info_index_with_duplicated_module_name(tmp_path):
+
+    # given
+    module_info_file = tmp_path / "module-info.json"
+    module_info_file.write_text(MODULE_INFO)
+
+    # when
+    index, _ = read_module_info(str(module_info_file), BUILD_OUT_PATH)
+
+    # then
+    assert len(index) == 2
+    assert index.find("libfoo", "system/lib/libfoo.so", "libfoo.so") == ("libfoo", ("vendor/foo",))
+    assert index.find("libbar", "system/lib/libbar.so", "libbar.so") == ("libbar", ("external/bar",))
+    assert index.find("foo", "vendor/lib/libfoo.so", "libfoo.so") == ("libfoo", ("vendor/foo",))
+    assert index.find("foo", "system/lib/libfoo.so", "foo.so") == ("libfoo", ("external/foo",))  # Not mixed
+    assert index.find("baz", "system/lib/libbaz.so", "libbaz.so") is None
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import os
+import re
+import zipfile
+import pytest
+from fosslight_android.android_binary_analysis import create_and_copy_notice_zip
+from fosslight_android.check_notice_file import (
+    NoticeIndex,
+    find_bin_in_notice,
+    find_files_by_extension,
+    read_file_names_in_notice
+)
+
+NOTICE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<licenses>
+<file-name contentId="1">/system/lib/libfoo.so</file-name>
+<file-content contentId="1"><![CDATA[Copyright]]></file-content>
+</licenses>
+"""
+
+
+def find_bin_in_notice_by_linear_search(binary_file_name, file_names):
+    if not binary_file_name:
+        return False
+    if binary_file_name in file_names:
+        return True
+    m = re.search(r"apex\/([^\/]+)\/", binary_file_name)
+    apex_names = [f"{m.group(1)}{suffix}" for suffix in [".apex", ".capex", "_compressed.apex", "-uncompressed.apex"]] if m else []
+    return any(os.path.basename(name) == os.path.basename(binary_file_name) or os.path.basename(name) in apex_names
+               for name in file_names)
+
+
+def write_gz(path, content):
+    with gzip.open(path, "wt") as f:
+        f.write(content)
+
+
+@pytest.mark.release
+def test_find_files_by_extension_with_only_gz_files(tmp_path):
+
+    # given
+    write_gz(tmp_path / "NOTICE.xml.gz", NOTICE_XML)
+    write_gz(tmp_path / "NOTICE_VENDOR.xml.gz", NOTICE_XML)
+    (tmp_path / "NOTICE.txt").write_text("notice")
+
+    # when
+    files = find_files_by_extension(str(tmp_path))
+
+    # then
+    assert sorted(files) == [str(tmp_path / "NOTICE.xml.gz"), str(tmp_path / "NOTICE_VENDOR.xml.gz")]
+    assert not (tmp_path / "NOTICE.xml").exists()
+
+
+@pytest.mark.release
+def test_notice_to_upload_is_decompressed(tmp_path):
+
+    # given
+    write_gz(tmp_path / "NOTICE.xml.gz", NOTICE_XML)
+    (tmp_path / "NOTICE_VENDOR.xml").write_text(NOTICE_XML)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    zip_file = str(out_dir / "notice.zip")
+
+    # when
+    single_file = create_and_copy_notice_zip([str(tmp_path / "NOTICE.xml.gz")], zip_file)
+    final_zip = create_and_copy_notice_zip([str(tmp_path / "NOTICE.xml.gz"), str(tmp_path / "NOTICE_VENDOR.xml")], zip_file)
+
+    # then
+    assert single_file == str(out_dir / "NOTICE.xml")
+    assert (out_dir / "NOTICE.xml").read_text() == NOTICE_XML
+    with zipfile.ZipFile(final_zip) as zipf:
+        assert sorted(zipf.namelist()) == ["NOTICE.xml", "NOTICE_VENDOR.xml"]
+        assert zipf.read("NOTICE.xml").decode() == NOTICE_XML
+
+
+@pytest.mark.release
+def test_read_file_names_in_notice_xml_with_invalid_characters(tmp_path):
+
+    # given
+    (tmp_path / "NOTICE.xml").write_bytes(b"<licenses><file-name>/system/lib/lib\x0cfoo.so</file-name>"
+                                          b"<file-name>/vendor/a &amp; b.so</file-name></licenses>")
+    (tmp_path / "NOTICE_VENDOR.xml").write_bytes(b"<licenses><file-name>/vendor/c & d.so</file-name>"
+                                                 b"<file-name>/vendor/e.so</file-name></licenses>")
+
+    # when
+    file_names = read_file_names_in_notice(str(tmp_path / "NOTICE.xml"))
+    unescaped_file_names = read_file_names_in_notice(str(tmp_path / "NOTICE_VENDOR.xml"))
+
+    # then
+    assert file_names == ["system/lib/libfoo.so", "vendor/a & b.so"]
+    assert unescaped_file_names == ["vendor/c & d.so", "vendor/e.so"]
+
+
+@pytest.mark.release
+def test_notice_index_finds_same_binaries_as_linear_search():
+
+    # given
+    file_names = ["system/lib/libfoo.so", "vendor/lib/libbar.so", "system/apex/com.android.art.capex",
+                  "system/apex/com.android.media_compressed.apex", "system/lib/libfoo.so"]
+    binaries = ["system/lib/libfoo.so", "system/lib64/libfoo.so", "odm/lib/libbar.so", "system/lib/libnone.so",
+                "apex/com.android.art/lib64/libart.so", "apex/com.android.media/lib/libmedia.so",
+                "apex/com.android.wifi/lib/libwifi.so", "com.android.art.capex", ""]
+
+    # when
+    notice_index = NoticeIndex(file_names)
+
+    # then
+    assert len(notice_index) == 4
+    assert "vendor/lib/libbar.so" in notice_index
+    assert sorted(notice_index) == sorted(set(file_names))
+    assert [find_bin_in_notice(binary, notice_index) for binary in binaries] == \
+        [find_bin_in_notice_by_linear_search(binary, file_names) for binary in binaries]
+    assert [find_bin_in_notice(binary, notice_index) for binary in binaries] == \
+        [True, True, True, False, True, True, False, True, False]
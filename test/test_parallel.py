@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+import pytest
+from fosslight_android._common import AndroidBinary
+from fosslight_android._parallel import apply_changes, run_in_parallel, split_list, split_list_by_weight
+
+
+def set_module_name_with_pid(indexed_list):
+    return [(idx, {"module_name": f"{item.bin_name}:{os.getpid()}"}) for idx, item in indexed_list]
+
+
+@pytest.mark.release
+def test_split_list_by_weight():
+
+    # given
+    rand = random.Random(0)
+    weights = [rand.randint(0, 1000) for _ in range(100)] + [100000]
+    input_list = list(range(len(weights)))
+
+    # when
+    chunks = split_list_by_weight(input_list, weights, 8)
+
+    # then
+    assert sorted(item for chunk in chunks for item in chunk) == input_list
+    assert chunks[0] == [len(weights) - 1]  # The heaviest item first, in a bundle of its own
+    assert all(weights[chunk[0]] >= weights[chunk[-1]] for chunk in chunks)
+    assert len(chunks) <= 8 + 1
+    assert split_list_by_weight([], [], 8) == []
+    assert split_list_by_weight(["a", "b"], [0, 0], 8) == [["a", "b"]]  # Empty files
+
+
+@pytest.mark.release
+def test_split_list():
+
+    # when
+    chunks = split_list(list(range(10)), 4)
+
+    # then
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+    assert split_list([1], 4) == [[1]]
+
+
+@pytest.mark.release
+def test_apply_changes():
+
+    # given
+    input_list = [AndroidBinary("system/lib/liba.so"), AndroidBinary("system/lib/libb.so")]
+
+    # when
+    apply_changes(input_list, [(1, {"checksum": "abc", "tlsh_calculated": True}), (0, {})])
+
+    # then
+    assert input_list[0].checksum == "0"
+    assert input_list[1].checksum == "abc"
+    assert input_list[1].tlsh_calculated
+
+
+@pytest.mark.release
+def test_run_in_parallel():
+
+    # given
+    input_list = [AndroidBinary(f"system/lib/lib{idx}.so") for idx in range(20)]
+
+    # when
+    result = run_in_parallel(set_module_name_with_pid, input_list, 2, weight=lambda item: len(item.bin_name))
+
+    # then
+    assert result is input_list
+    assert [item.module_name.split(":")[0] for item in input_list] == [item.bin_name for item in input_list]
+    assert all(item.module_name.split(":")[1] != str(os.getpid()) for item in input_list)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from fosslight_android._repo_manifest import read_repo_manifest
+
+MANIFEST = """<?xml version="1.0" encoding="UTF-8"?>
+<manifest>
+  <include name="default.xml" />
+</manifest>
+"""
+DEFAULT_MANIFEST = """<?xml version="1.0" encoding="UTF-8"?>
+<manifest>
+  <remote name="aosp" fetch=".." review="https://android-review.googlesource.com/" />
+  <default revision="refs/tags/android-12.1.0_r5" remote="aosp" />
+  <project path="external/zlib" name="platform/external/zlib"><copyfile src="a" dest="b" /></project>
+  <project path="external/removed" name="platform/external/removed" />
+  <project name="platform/art" />
+</manifest>
+"""
+LOCAL_MANIFEST = """<manifest>
+  <remove-project name="platform/external/removed" />
+  <project path="vendor/foo" name="foo" />
+</manifest>
+"""
+
+
+@pytest.mark.release
+def test_read_repo_manifest_follows_includes_and_local_manifests(tmp_path):
+
+    # given
+    repo_dir = tmp_path / ".repo"
+    (repo_dir / "manifests").mkdir(parents=True)
+    (repo_dir / "local_manifests").mkdir()
+    (repo_dir / "manifest.xml").write_text(MANIFEST)
+    (repo_dir / "manifests" / "default.xml").write_text(DEFAULT_MANIFEST)
+    (repo_dir / "local_manifests" / "vendor.xml").write_text(LOCAL_MANIFEST)
+    (repo_dir / "project.list").write_text("external/zlib\nhardware/synced\n")
+
+    # when
+    repository_index, platform_revision, _ = read_repo_manifest(str(tmp_path))
+
+    # then
+    assert platform_revision == "12.1.0"
+    assert len(repository_index) == 4
+    assert repository_index.find("external/zlib/src") == ("external/zlib", "")
+    assert repository_index.find("platform/art/runtime") == ("platform/art", "")
+    assert repository_index.find("vendor/foo") == ("vendor/foo", "")
+    assert repository_index.find("hardware/synced") == ("hardware/synced", "")
+    assert repository_index.find("external/removed") is None
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import pickle
+import pytest
+from fosslight_android._repository_index import RepositoryIndex
+
+
+def find_by_prefixes(repositories, directory):
+    # Longest prefix by joining the path components, as get_oss_component_name() did before the index.
+    directories = directory.split('/')
+    for idx in range(len(directories), 0, -1):
+        found_repository = "/".join(directories[0:idx])
+        if found_repository in repositories:
+            return found_repository, repositories[found_repository]
+    return None
+
+
+@pytest.mark.release
+def test_repository_index_finds_longest_repository():
+
+    # given
+    repositories = {"external/zlib": "", "frameworks/base": "https://android.googlesource.com/platform/frameworks/base",
+                    "frameworks/base/core": "", "device/": "", "art": ""}
+    index = pickle.loads(pickle.dumps(RepositoryIndex(repositories)))
+    directories = ["external/zlib", "external/zlib/src", "external/zlibx", "frameworks/base/core/jni", "frameworks/base/cmds",
+                   "frameworks", "device/", "device/google", "art", "art/runtime/", "", "/art"]
+
+    # when
+    found = [index.find(directory) for directory in directories]
+
+    # then
+    assert len(index) == len(repositories)
+    assert found == [find_by_prefixes(repositories, directory) for directory in directories]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: Copyright 2023 LG Electronics Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import pytest
+import tlsh
+from fosslight_android._tlsh_distance import INVALID_DISTANCE, find_first_within, tlsh_diff_many
+
+HEX_CHARS = "0123456789ABCDEF"
+
+
+def random_digest(rand):
+    return "T1" + "".join(rand.choice(HEX_CHARS) for _ in range(70))
+
+
+def mutate_digest(rand, digest):
+    chars = list(digest)
+    for _ in range(rand.randint(0, 8)):
+        chars[rand.randrange(2, len(chars))] = rand.choice(HEX_CHARS)
+    return "".join(chars)
+
+
+@pytest.mark.release
+def test_tlsh_diff_many_matches_tlsh_diff():
+
+    # given
+    rand = random.Random(0)
+    query = random_digest(rand)
+    candidates = [mutate_digest(rand, query) for _ in range(200)] + [random_digest(rand) for _ in range(20)]
+    candidates += [candidate[2:] for candidate in candidates[:10]]  # Digests without the version prefix
+
+    # when
+    distance = tlsh_diff_many(query, candidates)
+
+    # then
+    assert list(distance) == [tlsh.diff(query, candidate) for candidate in candidates]
+
+
+@pytest.mark.release
+def test_tlsh_diff_many_with_invalid_candidates():
+
+    # given
+    rand = random.Random(1)
+    query = random_digest(rand)
+    candidates = ["0", "TNULL", "", query]
+
+    # when
+    distance = tlsh_diff_many(query, candidates)
+
+    # then
+    assert list(distance) == [INVALID_DISTANCE, INVALID_DISTANCE, INVALID_DISTANCE, 0]
+    assert find_first_within(query, candidates, 120) == 3
+    assert find_first_within(query, candidates[:3], 120) == -1